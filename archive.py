@@ -0,0 +1,115 @@
+# archive.py
+import gzip
+import json
+import os
+import threading
+import time
+
+
+class HtmlArchive:
+    """
+    Ham HTML yanıtları için sıkıştırılmış, append-only arşiv.
+
+    Yerleşim (directory altında):
+      seg-00000.gz, seg-00001.gz ...  her kayıt bağımsız bir gzip member'ı
+      index.jsonl                     {"url", "site", "seg", "offset", "length", "status", "ts"}
+
+    Her kayıt ayrı gzip member olduğu için (seg, offset, length) ile tek kayıt
+    dosyanın geri kalanını açmadan okunur. Aynı URL tekrar yazılırsa index'teki
+    son satır geçerlidir.
+
+    Tek yazar varsayılır: birden fazla worker çalışıyorsa her biri kendi dizinini kullanmalı.
+    """
+
+    INDEX_NAME = "index.jsonl"
+
+    def __init__(self, directory: str = "archive", segment_bytes: int = 256 * 1024 * 1024, level: int = 6):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.level = level
+        self._lock = threading.Lock()
+        self._seg = None
+        self._seg_no = None
+
+    # ---------- PATHS ----------
+    def segment_path(self, n: int) -> str:
+        return os.path.join(self.directory, f"seg-{n:05d}.gz")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, self.INDEX_NAME)
+
+    def _current_segment(self) -> int:
+        n = 0
+        while os.path.exists(self.segment_path(n + 1)):
+            n += 1
+        if os.path.exists(self.segment_path(n)) and os.path.getsize(self.segment_path(n)) >= self.segment_bytes:
+            n += 1
+        return n
+
+    # ---------- WRITE ----------
+    def put(self, url: str, content: bytes, site: str | None = None, status: int = 200):
+        blob = gzip.compress(content, compresslevel=self.level)
+
+        with self._lock:
+            if self._seg is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._seg_no = self._current_segment()
+                self._seg = open(self.segment_path(self._seg_no), "ab")
+
+            offset = self._seg.tell()
+            self._seg.write(blob)
+            self._seg.flush()
+
+            entry = {
+                "url": url,
+                "site": site,
+                "seg": self._seg_no,
+                "offset": offset,
+                "length": len(blob),
+                "status": status,
+                "ts": time.time(),
+            }
+            # index satırı veriden sonra yazılır: yarım kayıt index'e girmez
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+            if offset + len(blob) >= self.segment_bytes:
+                self._seg.close()
+                self._seg = None
+
+    def close(self):
+        with self._lock:
+            if self._seg is not None:
+                self._seg.close()
+                self._seg = None
+
+    # ---------- READ ----------
+    def latest_entries(self) -> dict[str, dict]:
+        """URL -> son index kaydı."""
+        out = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        e = json.loads(line)
+                    except ValueError:
+                        continue   # yarım kalmış son satır
+                    out[e["url"]] = e
+        except FileNotFoundError:
+            pass
+        return out
+
+    def read(self, entry: dict) -> bytes:
+        return read_record(self.directory, entry["seg"], entry["offset"], entry["length"])
+
+    def get(self, url: str) -> bytes | None:
+        e = self.latest_entries().get(url)
+        return self.read(e) if e else None
+
+
+def read_record(directory: str, seg: int, offset: int, length: int) -> bytes:
+    """Tek kaydı oku (process pool worker'larında da kullanılır)."""
+    with open(os.path.join(directory, f"seg-{seg:05d}.gz"), "rb") as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(length))
@@ -0,0 +1,110 @@
+# bench_keywords.py
+"""
+keywords.keyword_for / keywords_for_rows ile eski iki implementasyonun karşılaştırması.
+
+    python bench_keywords.py [satır_sayısı]
+"""
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse, unquote
+
+from keywords import TR_STOPWORDS, keyword_for, keywords_for_rows
+
+
+# ---------- ESKİ: main.keyword_from_title_or_slug ----------
+_OLD_MAIN_STOPWORDS = {
+    "ve", "ile", "icin", "için", "da", "de", "ta", "te", "mi", "mı", "mu", "mü",
+    "bir", "bu", "şu", "o", "en", "cok", "çok", "gibi", "nedir", "nasil", "nasıl", "ne"
+}
+
+
+def old_main_keyword(baslik, url):
+    if baslik:
+        t = baslik.strip()
+        for sep in [" | ", " - ", " • ", " — ", " – "]:
+            if sep in t:
+                t = t.split(sep)[0].strip()
+                break
+        t = t.lower()
+        t = re.sub(r"[^\w\sçğıöşü-]", " ", t, flags=re.UNICODE)
+        t = t.replace("-", " ")
+        t = re.sub(r"\s+", " ", t).strip()
+        words = [w for w in t.split() if w not in _OLD_MAIN_STOPWORDS and len(w) > 2]
+        if words:
+            return " ".join(words[:4]).title()
+        return t.title() if t else "Genel"
+
+    path = (urlparse(url).path or "").rstrip("/")
+    slug = path.split("/")[-1] if path else ""
+    slug = slug.replace("-", " ").replace("_", " ").strip().lower()
+    slug = re.sub(r"[^\w\sçğıöşü]", " ", slug, flags=re.UNICODE)
+    slug = re.sub(r"\s+", " ", slug).strip()
+    words = [w for w in slug.split() if w not in _OLD_MAIN_STOPWORDS and len(w) > 2]
+    return (" ".join(words[:4]).title()) if words else (slug.title() if slug else "Genel")
+
+
+# ---------- ESKİ: scraper.generate_keyword ----------
+def _old_clean_text(s):
+    s = unquote(s or "").strip().lower()
+    s = re.sub(r"[^\w\sçğıöşü-]", " ", s, flags=re.UNICODE)
+    s = s.replace("-", " ").replace("_", " ")
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def old_scraper_keyword(baslik, url):
+    t = _old_clean_text(baslik)
+    if t:
+        words = [w for w in t.split() if w not in TR_STOPWORDS and len(w) > 2]
+        if not words:
+            words = t.split()
+        return " ".join(words[:4]).title()
+    path = urlparse(url).path.rstrip("/")
+    slug = _old_clean_text(path.split("/")[-1] if path else "")
+    if slug:
+        words = [w for w in slug.split() if w not in TR_STOPWORDS and len(w) > 2]
+        return " ".join(words[:4]).title() if words else slug.title()
+    return "Genel"
+
+
+# ---------- VERİ ----------
+VOCAB = ["implant", "diş", "tedavisi", "nedir", "nasıl", "yapılır", "ağrı", "çocuk", "sağlık",
+         "beyazlatma", "kanal", "ve", "ile", "için", "fiyatları", "2024", "kalp", "göz", "bir"]
+
+
+def make_rows(n, unique_ratio=0.3):
+    rnd = random.Random(42)
+    base = []
+    for i in range(max(1, int(n * unique_ratio))):
+        words = rnd.sample(VOCAB, rnd.randint(3, 7))
+        slug = "-".join(words)
+        title = " ".join(words).capitalize() + (" | Dentway" if i % 3 == 0 else "")
+        base.append({"baslik": title if i % 2 else None, "url": f"https://www.dentway.com.tr/blog/{slug}-{i}/"})
+    # tekrar eden satırlar: backfill / link ingest her run'da aynı satırları görür
+    return [base[rnd.randrange(len(base))] for _ in range(n)]
+
+
+def bench(name, fn, rows, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - t0)
+    print(f"{name:<34} {best * 1000:9.1f} ms  ({len(rows) / best:,.0f} satır/s)")
+    return best
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = make_rows(n)
+    print(f"{n} satır\n")
+
+    bench("eski main.keyword_from_title_or_slug", lambda rs: [old_main_keyword(r["baslik"], r["url"]) for r in rs], rows)
+    bench("eski scraper.generate_keyword", lambda rs: [old_scraper_keyword(r["baslik"] or "", r["url"]) for r in rs], rows)
+
+    keyword_for.cache_clear()
+    bench("keywords.keyword_for (soğuk cache)", lambda rs: (keyword_for.cache_clear(), keywords_for_rows(rs)), rows, repeat=1)
+    bench("keywords.keywords_for_rows (sıcak)", keywords_for_rows, rows)
+    print(f"\ncache: {keyword_for.cache_info()}")
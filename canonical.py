@@ -0,0 +1,133 @@
+# canonical.py
+import re
+from urllib.parse import urlparse, urlunparse, unquote
+
+
+# -------------------------
+# SITE KURALLARI
+# -------------------------
+# host           : kanonik host (www. var/yok tek biçim)
+# trailing_slash : path sonunda "/" olsun mu (WordPress siteleri "/" ile servis eder)
+SITE_RULES = {
+    "Dentway": {"domain": "dentway.com.tr", "host": "www.dentway.com.tr", "trailing_slash": True},
+    "Florence": {"domain": "florence.com.tr", "host": "www.florence.com.tr", "trailing_slash": False},
+    "ClinicWise": {"domain": "clinic-wise.com", "host": "clinic-wise.com", "trailing_slash": True},
+}
+
+_MULTI_SLASH_RE = re.compile(r"/{2,}")
+
+
+def site_for_url(url: str) -> str | None:
+    """URL'nin hangi siteye ait olduğunu host üzerinden bul."""
+    try:
+        netloc = urlparse(url).netloc.lower().split(":")[0]
+    except Exception:
+        return None
+    for site, rule in SITE_RULES.items():
+        d = rule["domain"]
+        if netloc == d or netloc.endswith("." + d):
+            return site
+    return None
+
+
+def canonical_url(url: str, site: str | None = None) -> str:
+    """
+    URL'yi tek bir kanonik biçime indir:
+      - query / fragment sil
+      - scheme + host küçük harf, varsayılan port sil
+      - çift slash'ları tekle
+      - bilinen sitelerin ana host'unda (domain / www.domain): https, kanonik host,
+        trailing slash kuralı
+    http(s) olmayan linkler (tel:, mailto: ...) olduğu gibi döner.
+    """
+    try:
+        u = urlparse((url or "").strip())
+    except Exception:
+        return url
+
+    scheme = u.scheme.lower()
+    if scheme not in ("http", "https") or not u.netloc:
+        return url
+
+    host = u.netloc.lower()
+    if host.endswith(":80") and scheme == "http":
+        host = host[:-3]
+    elif host.endswith(":443") and scheme == "https":
+        host = host[:-4]
+
+    path = _MULTI_SLASH_RE.sub("/", u.path or "/")
+
+    site = site or site_for_url(url)
+    rule = SITE_RULES.get(site) if site else None
+    # sadece domain / www.domain birebir eşleşirse; diğer alt domainler (en.) ve portlar korunur
+    if rule and host in (rule["domain"], "www." + rule["domain"]):
+        scheme = "https"
+        host = rule["host"]
+        if path != "/":
+            path = path.rstrip("/")
+            if rule["trailing_slash"]:
+                path += "/"
+
+    return urlunparse((scheme, host, path, "", "", ""))
+
+
+def url_variants(url: str) -> list[str]:
+    """
+    Kanonik URL'nin DB'de eski biçimlerde kayıtlı olabilecek halleri
+    (www./non-www., trailing slash var/yok). Var-yok kontrolünde kullanılır.
+    """
+    u = urlparse(url)
+    if u.scheme not in ("http", "https") or not u.netloc:
+        return [url]
+
+    host = u.netloc
+    bare = host[4:] if host.startswith("www.") else host
+    hosts = [host, bare if host.startswith("www.") else "www." + bare]
+
+    path = u.path.rstrip("/")
+    paths = [u.path] if not path else [path, path + "/"]
+
+    out = []
+    for h in hosts:
+        for p in paths:
+            out.append(urlunparse((u.scheme, h, p, "", "", "")))
+    return list(dict.fromkeys(out))
+
+
+# -------------------------
+# CROSS-PATH KOPYALAR
+# -------------------------
+def slug_text(url: str) -> str:
+    path = (urlparse(url).path or "").rstrip("/")
+    return path.split("/")[-1] if path else ""
+
+
+def slug_key(url: str) -> str:
+    """Karşılaştırma için son slug (percent-decode + küçük harf)."""
+    return unquote(slug_text(url)).lower()
+
+
+def drop_cross_path_duplicates(new_urls: list[str], known_urls) -> tuple[list[str], list[tuple[str, str]]]:
+    """
+    Son slug'ı bilinen bir URL'ninkiyle (ya da listede daha önce gelen yeni bir URL'ninkiyle)
+    birebir aynı olan yeni URL'leri ayıkla: /blog/x/ kayıtlıysa /tedavi/x/ aynı makaledir.
+    Benzer ama farklı slug'lar (tedavisi-goz vs tedavisi-goz-cocuk) ayrı makaledir, dokunulmaz.
+    (kalanlar, [(atlanan, eşleştiği)]) döndürür.
+    """
+    seen = {}
+    for u in known_urls:
+        k = slug_key(u)
+        if k:
+            seen.setdefault(k, u)
+
+    unique, dropped = [], []
+    for u in new_urls:
+        k = slug_key(u)
+        dup = seen.get(k) if k else None
+        if dup and dup != u:
+            dropped.append((u, dup))
+            continue
+        if k:
+            seen[k] = u
+        unique.append(u)
+    return unique, dropped
@@ -0,0 +1,134 @@
+# checkpoint.py
+import json
+import os
+import tempfile
+import time
+
+
+class CrawlCheckpoint:
+    """
+    Site bazlı link toplama checkpoint'i.
+
+    Diskte (CHECKPOINT_DIR/<site>.json) şunları tutar:
+      - frontier : henüz ziyaret edilmemiş liste sayfaları
+      - visited  : ziyaret edilmiş liste sayfaları
+      - links    : toplanmış ama DB'ye henüz yazılmamış linkler
+      - collected: link toplama bitti mi (sadece DB yazımı kaldı)
+
+    Süreç ortada ölürse bir sonraki run() kaldığı yerden devam eder.
+    Dosya sayfa bazında yazılır (her flush_every ziyaret edilen sayfada bir; link
+    ekleme tek başına yazım tetiklemez, yoksa büyük frontier'de yazımlar karesel büyür).
+    DB yazımı başarılı olunca commit() dosyayı siler.
+    """
+
+    def __init__(self, site: str, directory: str = ".checkpoints", flush_every: int = 1):
+        self.site = site
+        self.path = os.path.join(directory, f"{site.lower()}.json")
+        self.flush_every = max(1, flush_every)
+
+        self.frontier: list[str] = []
+        self.visited: set[str] = set()
+        self.links: dict[str, None] = {}   # sıralı set
+        self.collected = False
+
+        self._dirty = 0
+        self._pages = 0   # son flush'tan beri ziyaret edilen sayfa
+        self.resumed = self._load()
+
+    # ---------- STATE ----------
+    def _load(self) -> bool:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"⚠️ Checkpoint okunamadı ({self.path}): {e}")
+            return False
+
+        self.frontier = list(state.get("frontier") or [])
+        self.visited = set(state.get("visited") or [])
+        self.links = dict.fromkeys(state.get("links") or [])
+        self.collected = bool(state.get("collected"))
+        return True
+
+    def plan(self, pages: list[str]):
+        """Frontier boşsa (ilk çalışma) ziyaret edilecek sayfaları kaydet."""
+        if not self.frontier and not self.visited:
+            self.frontier = list(pages)
+            self._dirty += 1
+            self.flush()
+
+    def is_visited(self, page: str) -> bool:
+        return page in self.visited
+
+    def add_links(self, links: list[str]) -> int:
+        before = len(self.links)
+        for u in links:
+            self.links[u] = None
+        added = len(self.links) - before
+        if added:
+            self._dirty += 1   # sayfa bitince (mark_visited) diske iner
+        return added
+
+    def mark_visited(self, page: str):
+        self.visited.add(page)
+        if page in self.frontier:
+            self.frontier.remove(page)
+        self._dirty += 1
+        self._pages += 1
+        if self._pages >= self.flush_every:
+            self.flush()
+
+    def mark_collected(self):
+        self.collected = True
+        self.frontier = []
+        self.flush(force=True)
+
+    # ---------- PERSIST ----------
+    def flush(self, force: bool = False):
+        if not self._dirty and not force:
+            return
+
+        state = {
+            "site": self.site,
+            "frontier": self.frontier,
+            "visited": sorted(self.visited),
+            "links": list(self.links),
+            "collected": self.collected,
+            "updated_at": time.time(),
+        }
+
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # atomik yazım: yarım kalmış dosya asla okunmasın
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".ckpt-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = 0
+            self._pages = 0
+        except Exception as e:
+            print(f"⚠️ Checkpoint yazılamadı ({self.path}): {e}")
+
+    def commit(self, save) -> bool:
+        """save() (DB yazımı) başarılıysa checkpoint'i sil; değilse bir sonraki run için bırak."""
+        ok = bool(save())
+        if ok:
+            self.clear()
+        return ok
+
+    def clear(self):
+        self.frontier = []
+        self.visited = set()
+        self.links = {}
+        self.collected = False
+        self._dirty = 0
+        self._pages = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Checkpoint silinemedi ({self.path}): {e}")
@@ -0,0 +1,220 @@
+# export.py
+import gzip
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from reprocess import iter_article_pages
+
+
+DOMAIN_MAP = {
+    "ClinicWise": "clinic-wise.com",
+    "Florence": "www.florence.com.tr",
+    "Dentway": "www.dentway.com.tr",
+}
+
+MIN_CONTENT_CHARS = 200
+
+
+def build_linkify_payload(row: dict, include_url: bool = False) -> dict | None:
+    """
+    Scraper DB kaydından linkify_with_images payload'ı: {"text", "topic", "domain"}.
+
+    Scraper makale içeriği çekmiyor. icerik/content doluysa (>=200 karakter) text odur;
+    değilse text başlıktır (o da yoksa keyword), yani endpoint'e tam makale değil kısa
+    bir metin gider. include_url=True ise kaynak URL "url" anahtarıyla eklenir
+    (endpoint bu anahtarı tanımıyorsa kapalı tutun; MODE=export'ta EXPORT_INCLUDE_URL=1).
+    """
+
+    # 1️⃣ DOMAIN
+    site = row.get("site_adi")
+    domain = DOMAIN_MAP.get(site)
+    if not domain:
+        return None
+
+    baslik = (row.get("baslik") or "").strip()
+    keyword = (row.get("keyword") or "").strip()
+
+    # 2️⃣ TEXT: içerik varsa o, yoksa başlık (o da yoksa keyword)
+    content = (row.get("icerik") or row.get("content") or "").strip()
+    text = content if len(content) >= MIN_CONTENT_CHARS else (baslik or keyword)
+    if not text:
+        return None
+
+    # 3️⃣ TOPIC
+    topic = baslik or keyword or text.split(".")[0][:120]
+
+    payload = {
+        "text": text,
+        "topic": topic,
+        "domain": domain,
+    }
+    if include_url and row.get("url"):
+        payload["url"] = row["url"]
+    return payload
+
+
+class LinkifyExporter:
+    """
+    articles tablosunu id üzerinden keyset pagination ile sayfa sayfa okur,
+    her satır için build_payload(row) çalıştırır ve:
+      - mode="file": payload'ları gzip'li JSONL shard'lara yazar
+      - mode="post": payload'ları linkify endpoint'ine sınırlı eşzamanlılıkla POST eder
+
+    İlerleme (son id, shard no) <out_dir>/_state.json içinde tutulur;
+    iş yarıda kalırsa aynı komut kaldığı yerden devam eder.
+    """
+
+    def __init__(
+        self,
+        sb,
+        build_payload,
+        mode: str = "file",
+        out_dir: str = "exports",
+        endpoint: str | None = None,
+        page_size: int = 500,
+        shard_rows: int = 5000,
+        concurrency: int = 8,
+        timeout: int = 30,
+    ):
+        if mode not in ("file", "post"):
+            raise ValueError(f"Bilinmeyen export modu: {mode}")
+        if mode == "post" and not endpoint:
+            raise ValueError("mode=post için LINKIFY_ENDPOINT gerekli.")
+
+        self.sb = sb
+        self.build_payload = build_payload
+        self.mode = mode
+        self.out_dir = out_dir
+        self.endpoint = endpoint
+        self.page_size = page_size
+        self.shard_rows = shard_rows
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+
+        self.state_path = os.path.join(out_dir, "_state.json")
+        self.state = {"last_id": 0, "shard": 0, "shard_count": 0, "exported": 0, "skipped": 0, "failed": 0}
+
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+        self._shard = None
+
+    # ---------- STATE ----------
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+            print(f"♻️ Export kaldığı yerden devam: id > {self.state['last_id']}")
+        except FileNotFoundError:
+            pass
+
+    def _save_state(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.out_dir, prefix=".state-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.state_path)
+
+    # ---------- SOURCE ----------
+    def iter_pages(self, after_id: int):
+        """id > after_id olan satırları page_size'lık sayfalar halinde akıt."""
+        return iter_article_pages(self.sb, "*", self.page_size, after_id)
+
+    # ---------- SINKS ----------
+    def _shard_path(self, n: int) -> str:
+        return os.path.join(self.out_dir, f"linkify-{n:05d}.jsonl.gz")
+
+    def _write_payloads(self, payloads: list[dict]):
+        if self._shard is None:
+            # yarım shard .tmp'de kalır, sadece tamamlanınca yerine taşınır
+            self._shard = gzip.open(self._shard_path(self.state["shard"]) + ".tmp", "wt", encoding="utf-8")
+            self.state["shard_count"] = 0
+        for p in payloads:
+            self._shard.write(json.dumps(p, ensure_ascii=False) + "\n")
+        self.state["shard_count"] += len(payloads)
+
+    def _commit_shard(self):
+        """Açık shard'ı kapat, yerine taşı; state bu noktaya kadar ilerler."""
+        if self._shard is None:
+            return
+        self._shard.close()
+        self._shard = None
+        final = self._shard_path(self.state["shard"])
+        if self.state["shard_count"]:
+            os.replace(final + ".tmp", final)
+            self.state["shard"] += 1
+        else:
+            os.remove(final + ".tmp")
+        self.state["shard_count"] = 0
+
+    def _post_one(self, payload: dict) -> bool:
+        for attempt in range(3):
+            try:
+                r = self._http.post(self.endpoint, json=payload, timeout=self.timeout)
+                if r.status_code < 500:
+                    return 200 <= r.status_code < 300
+            except requests.RequestException:
+                pass
+            time.sleep(0.5 * (attempt + 1))
+        return False
+
+    def _post_payloads(self, pool: ThreadPoolExecutor, payloads: list[dict]):
+        failed = [p for p, ok in zip(payloads, pool.map(self._post_one, payloads)) if not ok]
+        if failed:
+            # tekrar denemek için sakla, export'u durdurma
+            with open(os.path.join(self.out_dir, "failed.jsonl"), "a", encoding="utf-8") as f:
+                for p in failed:
+                    f.write(json.dumps(p, ensure_ascii=False) + "\n")
+            self.state["failed"] += len(failed)
+
+    # ---------- RUN ----------
+    def run(self) -> dict:
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._load_state()
+        t0 = time.time()
+
+        last_id = self.state["last_id"]
+        exported = skipped = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for rows in self.iter_pages(last_id):
+                payloads = [p for p in pool.map(self.build_payload, rows) if p]
+                skipped += len(rows) - len(payloads)
+                exported += len(payloads)
+                last_id = rows[-1]["id"]
+
+                if self.mode == "file":
+                    self._write_payloads(payloads)
+                    if self.state["shard_count"] < self.shard_rows:
+                        # shard dolmadı: state'i kaydetme, sonraki sayfayı aynı shard'a yaz
+                        print(f"📦 Export: id<={last_id} | +{len(payloads)} payload")
+                        continue
+                    self._commit_shard()
+                else:
+                    self._post_payloads(pool, payloads)
+
+                self.state["last_id"] = last_id
+                self.state["exported"] += exported
+                self.state["skipped"] += skipped
+                exported = skipped = 0
+                self._save_state()
+                print(f"📦 Export: id<={last_id} | +{len(payloads)} payload "
+                      f"| toplam {self.state['exported']} (atlanan {self.state['skipped']})")
+
+        if self.mode == "file":
+            self._commit_shard()
+        self.state["last_id"] = last_id
+        self.state["exported"] += exported
+        self.state["skipped"] += skipped
+        self._save_state()
+
+        print(f"✅ Export bitti: {self.state['exported']} payload, {self.state['skipped']} atlandı, "
+              f"{self.state['failed']} başarısız, {time.time() - t0:.1f}s")
+        return self.state
@@ -0,0 +1,296 @@
+# extract.py
+import json
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from keywords import TITLE_SEPARATORS
+from selector_stats import SelectorStats
+
+
+# -------------------------
+# DETAIL SELECTORS
+# -------------------------
+# Sıra önceliktir (listeler örtüşür: h1 ⊇ article h1); SelectorStats sırayı değiştirmez.
+DETAIL_SELECTORS = {
+    "Dentway": {
+        "title": ["h1", ".entry-title", "article h1"],
+        "date": ["time", ".date", ".post-date", "article time"],
+    },
+    "Florence": {
+        "title": ["h1", ".page-title", ".news-detail h1", "article h1"],
+        "date": ["time", ".date", ".publish-date", "article time"],
+    },
+    "ClinicWise": {
+        "title": ["article h1", ".blog-title", "h1"],
+        "date": ["time", ".post-date", ".published-date"],
+    },
+    "*": {
+        "title": ["h1", "article h1"],
+        "date": ["time", ".date"],
+    },
+}
+
+# -------------------------
+# METADATA (JSON-LD / OpenGraph / meta)
+# -------------------------
+ARTICLE_TYPES = {"Article", "BlogPosting", "NewsArticle", "MedicalWebPage", "MedicalScholarlyArticle", "Report"}
+
+META_TITLE_KEYS = [("property", "og:title"), ("name", "twitter:title")]
+META_DATE_KEYS = [
+    ("property", "article:published_time"),
+    ("name", "article:published_time"),
+    ("property", "og:published_time"),
+    ("itemprop", "datePublished"),
+    ("name", "date"),
+    ("name", "pubdate"),
+    ("name", "publish-date"),
+    ("name", "DC.date.issued"),
+]
+
+_HEAD_END_B = re.compile(rb"</head\s*>", re.IGNORECASE)
+_HEAD_END_S = re.compile(r"</head\s*>", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+# Başlık sonundaki site/marka ekleri ("... | Dentway"); clean_title sadece bunları keser
+SITE_BRANDS = {
+    "Dentway": ("dentway",),
+    "Florence": ("florence nightingale", "florence"),
+    "ClinicWise": ("clinicwise", "clinic wise", "clinic-wise"),
+}
+_ALL_BRANDS = tuple(b for brands in SITE_BRANDS.values() for b in brands)
+
+
+def _is_brand(segment: str, brands: tuple[str, ...]) -> bool:
+    seg = segment.strip().replace("İ", "i").lower()
+    # "Florence Nightingale Hastanesi", "clinic-wise.com" da marka sayılır
+    return any(seg == b or seg.startswith(b + " ") or seg.startswith(b + ".") for b in brands)
+
+
+def clean_title(baslik: str | None, site: str | None = None) -> str | None:
+    """
+    Sondaki site/marka ekini ("... | Dentway") ve fazla boşlukları at.
+    Ayırıcıdan sonraki kısım bilinen bir marka değilse başlığın parçasıdır, dokunulmaz
+    ("Bel Ağrısı — Ne Zaman Doktora Gitmeli?").
+    """
+    if not baslik:
+        return baslik
+    brands = SITE_BRANDS.get(site, _ALL_BRANDS) if site else _ALL_BRANDS
+    t = baslik
+    while True:
+        cut = max((t.rfind(sep), sep) for sep in TITLE_SEPARATORS)
+        pos, sep = cut
+        if pos <= 0 or not t[:pos].strip() or not _is_brand(t[pos + len(sep):], brands):
+            break
+        t = t[:pos]
+    return _SPACE_RE.sub(" ", t).strip() or None
+
+
+def _jsonld_nodes(data):
+    if isinstance(data, list):
+        for x in data:
+            yield from _jsonld_nodes(x)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _jsonld_nodes(data["@graph"])
+
+
+def _is_article_type(node: dict) -> bool:
+    t = node.get("@type")
+    types = t if isinstance(t, list) else [t]
+    return any(x in ARTICLE_TYPES for x in types if isinstance(x, str))
+
+
+def _meta(soup: BeautifulSoup, keys: list[tuple[str, str]]) -> str | None:
+    for attr, value in keys:
+        el = soup.find("meta", attrs={attr: value})
+        if el and (el.get("content") or "").strip():
+            return el["content"].strip()
+    return None
+
+
+def _str_or_none(value) -> str | None:
+    # JSON-LD'de headline/name bazen dict/list gelir: sadece string kabul
+    return (value.strip() or None) if isinstance(value, str) else None
+
+
+def extract_metadata(soup: BeautifulSoup, site: str | None = None) -> tuple[str | None, str | None, bool]:
+    """
+    <head> içindeki yapılandırılmış kaynaklardan (title, ISO tarih, makale_mi).
+    Sıra: JSON-LD Article -> article:published_time / og:title -> diğer meta'lar.
+    """
+    order = date_order(site)
+    title = date = None
+    is_article = False
+
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or "")
+        except (ValueError, TypeError):
+            continue
+        for node in _jsonld_nodes(data):
+            if not _is_article_type(node):
+                continue
+            is_article = True
+            title = title or _str_or_none(node.get("headline")) or _str_or_none(node.get("name"))
+            date = date or to_iso_date(node.get("datePublished") or node.get("dateCreated"), order)
+        if title and date:
+            break
+
+    og_type = _meta(soup, [("property", "og:type")])
+    if og_type and og_type.lower() == "article":
+        is_article = True
+
+    if not title:
+        title = clean_title(_meta(soup, META_TITLE_KEYS), site)
+    if not date:
+        date = to_iso_date(_meta(soup, META_DATE_KEYS), order)
+
+    if title:
+        title = _SPACE_RE.sub(" ", title).strip() or None
+    return title, date, is_article
+
+
+# -------------------------
+# DATE -> ISO-8601
+# -------------------------
+MONTHS = {
+    "ocak": 1, "şubat": 2, "subat": 2, "mart": 3, "nisan": 4, "mayıs": 5, "mayis": 5, "haziran": 6,
+    "temmuz": 7, "ağustos": 8, "agustos": 8, "eylül": 9, "eylul": 9, "ekim": 10, "kasım": 11, "kasim": 11,
+    "aralık": 12, "aralik": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "sept": 9,
+    "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Sayısal tarihlerde (03/12/2024) gün/ay sırası. Varsayılan gün.ay.yıl;
+# İngilizce siteler ay/gün/yıl yazar.
+SITE_DATE_ORDER = {
+    "ClinicWise": "mdy",
+}
+
+_ISO_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_NUMERIC_RE = re.compile(r"\b(\d{1,2})[./-](\d{1,2})[./-](\d{4})\b")
+_D_MONTH_Y_RE = re.compile(r"\b(\d{1,2})\.?\s+([^\W\d_]+)\s*,?\s+(\d{4})\b", re.UNICODE)
+_MONTH_D_Y_RE = re.compile(r"\b([^\W\d_]+)\s+(\d{1,2}),?\s+(\d{4})\b", re.UNICODE)
+
+
+def _iso(y: int, m: int, d: int) -> str | None:
+    try:
+        return datetime(y, m, d).date().isoformat()
+    except ValueError:
+        return None
+
+
+def date_order(site: str | None) -> str:
+    return SITE_DATE_ORDER.get(site, "dmy") if site else "dmy"
+
+
+def to_iso_date(text, order: str = "dmy") -> str | None:
+    """
+    '2024-03-12T10:00:00+03:00', '12.03.2024', '12 Mart 2024', 'March 12, 2024' -> '2024-03-12'.
+    order="mdy" ise '03/12/2024' -> '2024-03-12'; sıraya göre imkânsızsa (25/12) diğeri denenir.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+    t = text.strip()
+
+    m = _ISO_RE.search(t)
+    if m:
+        return _iso(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+    m = _NUMERIC_RE.search(t)
+    if m:
+        a, b, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        d, mo = (b, a) if order == "mdy" else (a, b)
+        return _iso(y, mo, d) or _iso(y, d, mo)
+
+    low = t.replace("İ", "i").lower()
+    m = _D_MONTH_Y_RE.search(low)
+    if m and m.group(2) in MONTHS:
+        return _iso(int(m.group(3)), MONTHS[m.group(2)], int(m.group(1)))
+
+    m = _MONTH_D_Y_RE.search(low)
+    if m and m.group(1) in MONTHS:
+        return _iso(int(m.group(3)), MONTHS[m.group(1)], int(m.group(2)))
+
+    return None
+
+
+# -------------------------
+# DETAIL EXTRACTION
+# -------------------------
+# process pool worker'larında diske yazmayan, process'e özel istatistik
+_LOCAL_STATS = SelectorStats(path=None)
+
+
+def extract_detail(site: str, soup: BeautifulSoup, stats: SelectorStats | None = None) -> tuple[str | None, str | None]:
+    """Görünür elementlerden (h1, time ...) (title, date) çıkar. Network yok."""
+    stats = stats or _LOCAL_STATS
+    key = site if site in DETAIL_SELECTORS else "*"
+    sels = DETAIL_SELECTORS[key]
+
+    title = stats.pick_text(soup, key, "title", sels["title"])
+
+    # ❌ ClinicWise: title yoksa veya çok kısa ise → içerik değildir
+    if site == "ClinicWise" and (not title or len(title) < 10):
+        return None, None
+
+    # <time datetime="..."> makine okunur tarihi görünür metinden önce gelir
+    el = soup.select_one("time[datetime]")
+    date = to_iso_date(el.get("datetime"), date_order(site)) if el else None
+    if not date:
+        txt = stats.pick_text(soup, key, "date", sels["date"])
+        date = to_iso_date(txt, date_order(site)) or txt
+    return title, date
+
+
+def _from_metadata(site: str, soup: BeautifulSoup) -> tuple[str | None, str | None]:
+    title, date, is_article = extract_metadata(soup, site)
+    # ClinicWise'da landing page'lerin de og:title'ı var: sadece makale işaretliyse güven
+    if site == "ClinicWise" and not is_article:
+        return None, None
+    return title, date
+
+
+def extract_detail_from_html(site: str, html: bytes | str, stats: SelectorStats | None = None) -> tuple[str | None, str | None]:
+    """
+    Ham HTML'den (title, date). Önce sadece <head> parse edilir; JSON-LD / OpenGraph /
+    meta ikisini de veriyorsa body hiç parse edilmez. Eksik kalan alan görünür
+    elementlerden tamamlanır. Process pool'a gönderilebilir (bytes girer, tuple çıkar).
+    """
+    head_end = (_HEAD_END_B if isinstance(html, bytes) else _HEAD_END_S).search(html)
+    title = date = None
+    if head_end:
+        title, date = _from_metadata(site, BeautifulSoup(html[:head_end.end()], "html.parser"))
+        if title and date:
+            return title, date
+
+    soup = BeautifulSoup(html, "html.parser")
+    if not head_end:
+        title, date = _from_metadata(site, soup)
+        if title and date:
+            return title, date
+
+    vis_title, vis_date = extract_detail(site, soup, stats)
+    return title or vis_title, date or vis_date
+
+
+def parse_detail_job(site: str, html: bytes, stats_snapshot: dict) -> tuple[str | None, str | None, list[tuple]]:
+    """
+    Detay pipeline'ının process pool girişi: (title, date, selector_kayıtları).
+    Worker ana process'in istatistiğiyle (snapshot) aynı selector'leri atlar; yaptığı
+    kayıtlar geri döner ve ana process'te SelectorStats.merge() ile kalıcı istatistiğe işlenir.
+    """
+    stats = _LOCAL_STATS
+    stats.load_snapshot(stats_snapshot)
+    stats.events = []
+    try:
+        title, date = extract_detail_from_html(site, html, stats)
+        return title, date, stats.events
+    finally:
+        stats.events = None
@@ -0,0 +1,79 @@
+# http_client.py
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+
+class PerOriginLimiter:
+    """
+    client.get'i origin (scheme + host[:port]) başına en fazla `limit` eşzamanlı istekle sınırlar.
+    httpx.Limits ve requests havuzu tek başına bunu garanti etmez
+    (httpx'te limit havuz geneli, requests'te pool_block=False havuzu aşar).
+    """
+
+    def __init__(self, client, limit: int):
+        self.client = client
+        self.limit = max(1, limit)
+        self._lock = threading.Lock()
+        self._sems: dict[tuple, threading.BoundedSemaphore] = {}
+
+    def _sem(self, url: str) -> threading.BoundedSemaphore:
+        u = urlparse(url)
+        key = (u.scheme, u.netloc.lower())
+        with self._lock:
+            sem = self._sems.get(key)
+            if sem is None:
+                sem = self._sems[key] = threading.BoundedSemaphore(self.limit)
+            return sem
+
+    def get(self, url: str, **kwargs):
+        with self._sem(url):
+            return self.client.get(url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+def make_http_client(backend: str = "requests", max_per_host: int = 10, keepalive_seconds: float = 30):
+    """
+    Detay fetch için HTTP istemcisi; origin başına max_per_host eşzamanlı istek.
+      - requests: HTTP/1.1, host başına keep-alive havuzu
+      - http2   : httpx + h2; aynı origin'e tek TLS bağlantı üzerinden multiplex,
+                  TLS oturumu bağlantı havuzunda yeniden kullanılır
+    İkisi de .get(url, timeout=...) -> .status_code / .text arayüzünü sağlar.
+    """
+    if backend == "http2":
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError("HTTP_BACKEND=http2 için 'httpx[http2]' kurulu olmalı: pip install 'httpx[http2]'")
+
+        client = httpx.Client(
+            http2=True,
+            headers=HTTP_HEADERS,
+            follow_redirects=True,   # requests ile aynı davranış
+            limits=httpx.Limits(
+                # havuz geneli limit yok; origin limiti PerOriginLimiter'da
+                max_connections=None,
+                max_keepalive_connections=None,
+                keepalive_expiry=keepalive_seconds,
+            ),
+        )
+        return PerOriginLimiter(client, max_per_host)
+
+    if backend != "requests":
+        raise RuntimeError(f"Bilinmeyen HTTP_BACKEND: {backend}")
+
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max_per_host)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return PerOriginLimiter(session, max_per_host)
@@ -0,0 +1,75 @@
+# keywords.py
+import os
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit, unquote
+
+
+# scraper.py ve main.py'deki iki ayrı listenin birleşimi
+TR_STOPWORDS = frozenset({
+    "ve", "ile", "icin", "için", "da", "de", "ta", "te", "mi", "mı", "mu", "mü",
+    "bir", "bu", "şu", "o", "en", "cok", "çok", "gibi", "nedir", "nasil", "nasıl", "ne",
+    "kadar", "var", "yok",
+})
+
+TITLE_SEPARATORS = (" | ", " - ", " • ", " — ", " – ")
+MAX_WORDS = 4
+FALLBACK = "Genel"
+
+# başlıkta "_" kelimenin parçası kalır, slug'da ayırıcıdır
+_TITLE_JUNK_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_SLUG_JUNK_RE = re.compile(r"[^\w\s]|_", re.UNICODE)
+
+KEYWORD_CACHE_SIZE = int(os.getenv("KEYWORD_CACHE_SIZE", "65536"))
+
+
+def _keep(words: list[str]) -> list[str]:
+    return [w for w in words if len(w) > 2 and w not in TR_STOPWORDS]
+
+
+def _lower(s: str) -> str:
+    # "İ".lower() -> "i̇" (birleşik nokta) regex'te kelimeyi böler: "İmplant" -> "mplant"
+    return s.replace("İ", "i").lower()
+
+
+def title_words(baslik: str) -> list[str]:
+    t = baslik.strip()
+    for sep in TITLE_SEPARATORS:
+        if sep in t:
+            t = t.split(sep)[0]
+            break
+    return _TITLE_JUNK_RE.sub(" ", _lower(t)).split()
+
+
+def slug_words(url: str) -> list[str]:
+    path = (urlsplit(url).path or "").rstrip("/")
+    slug = path.rsplit("/", 1)[-1] if path else ""
+    return _SLUG_JUNK_RE.sub(" ", _lower(unquote(slug))).split()
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def keyword_for(baslik: str | None, url: str) -> str:
+    """
+    Başlıktan (yoksa URL slug'ından) en fazla 4 kelimelik keyword üret.
+    (baslik, url) bazında LRU cache'li; aynı satır tekrar tokenize edilmez.
+    """
+    # 1) Başlıktan üret
+    if baslik:
+        words = title_words(baslik)
+        kept = _keep(words)
+        if kept:
+            return " ".join(kept[:MAX_WORDS]).title()
+        return " ".join(words).title() if words else FALLBACK
+
+    # 2) URL slug fallback
+    words = slug_words(url)
+    kept = _keep(words)
+    if kept:
+        return " ".join(kept[:MAX_WORDS]).title()
+    return " ".join(words).title() if words else FALLBACK
+
+
+def keywords_for_rows(rows: list[dict], title_key: str = "baslik", url_key: str = "url") -> list[str]:
+    """Toplu API: satır listesi için keyword listesi (aynı sırada)."""
+    fn = keyword_for
+    return [fn(r.get(title_key) or None, r[url_key]) for r in rows]
@@ -0,0 +1,74 @@
+# linkify_stub.py
+"""
+linkify_with_images endpoint'inin lokal taklidi (export testleri için).
+
+    python linkify_stub.py --port 8765 --out stub_received.jsonl
+    LINKIFY_ENDPOINT=http://127.0.0.1:8765/linkify MODE=export EXPORT_MODE=post python main.py
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REQUIRED_KEYS = ("text", "topic", "domain")
+
+
+def make_handler(out_path: str | None):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        received = 0
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return self._reply(400, {"error": "invalid json"})
+
+            missing = [k for k in REQUIRED_KEYS if not payload.get(k)]
+            if missing:
+                return self._reply(422, {"error": f"missing: {', '.join(missing)}"})
+
+            with lock:
+                Handler.received += 1
+                if out_path:
+                    with open(out_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+            self._reply(200, {"ok": True, "text": payload["text"]})
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, out_path: str | None = None):
+    """Arka planda stub başlat; (server, endpoint_url) döndürür. port=0 -> boş port."""
+    server = ThreadingHTTPServer((host, port), make_handler(out_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/linkify"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.out))
+    print(f"🧪 Linkify stub: http://{args.host}:{args.port}/linkify")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
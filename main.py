@@ -2,11 +2,12 @@
 import os
 import time
 import random
-import re
-from urllib.parse import urlparse, urlunparse
+import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -18,19 +19,25 @@ from selenium.webdriver.chrome.service import Service
 
 from supabase import create_client
 from dotenv import load_dotenv
-from datetime import datetime,timezone
+from datetime import datetime,timedelta,timezone
 from urllib.parse import urlparse
 
+from archive import HtmlArchive
+from canonical import canonical_url, drop_cross_path_duplicates, site_for_url, url_variants
+from checkpoint import CrawlCheckpoint
+from export import LinkifyExporter, build_linkify_payload
+from extract import date_order, extract_detail_from_html, parse_detail_job, to_iso_date
+from http_client import make_http_client
+from keywords import keyword_for, keywords_for_rows
+from process_pool import fork_available, make_process_pool
+from reextract import reextract_archive
+from reprocess import Reprocessor, iter_article_pages, upsert_in_batches
+from scheduler import DetailBudget, run_fair
+from selector_stats import SelectorStats
+from url_rules import UrlClassifier
 
-datetime.now(timezone.utc).isoformat()
-
-# ========= LINKIFY DOMAIN MAP =========
-DOMAIN_MAP = {
-    "ClinicWise": "clinic-wise.com",
-    "Florence": "www.florence.com.tr",
-    "Dentway": "www.dentway.com.tr",
-}
 
+datetime.now(timezone.utc).isoformat()
 
 # -------------------------
 # BOOTSTRAP
@@ -48,7 +55,7 @@ sb = create_client(SUPABASE_URL, SUPABASE_KEY)
 # -------------------------
 # CONFIG
 # -------------------------
-MODE = os.getenv("MODE", "auto").lower()               # auto | links | details | keywords
+MODE = os.getenv("MODE", "auto").lower()               # auto | links | details | keywords | export | reextract | reprocess
 AUTO_DETAILS = os.getenv("AUTO_DETAILS", "1") == "1"   # auto modda details çalışsın mı
 DETAIL_BATCH_LIMIT = int(os.getenv("DETAIL_BATCH_LIMIT", "25"))
 DETAIL_ROUNDS = int(os.getenv("DETAIL_ROUNDS", "2"))
@@ -60,18 +67,70 @@ CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")     # opsiyonel
 # Dentway: sadece blog mu?
 DENTWAY_ONLY_BLOG = os.getenv("DENTWAY_ONLY_BLOG", "0") == "1"
 
+# Link toplama checkpoint'i (yarıda kalan crawl kaldığı yerden devam eder);
+# FLUSH_EVERY: kaç liste sayfası ziyaretinde bir diske yazılsın
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "1") == "1"
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", ".checkpoints")
+CHECKPOINT_FLUSH_EVERY = int(os.getenv("CHECKPOINT_FLUSH_EVERY", "1"))
+
+# Aynı slug'ın farklı path altında (/blog/x vs /tedavi/x) tekrar kuyruğa girmesini engelle
+CROSS_PATH_DEDUP = os.getenv("CROSS_PATH_DEDUP", "1") == "1"
+
+# MODE=export: linkify payload toplu export
+EXPORT_MODE = os.getenv("EXPORT_MODE", "file").lower()   # file | post
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+EXPORT_SHARD_ROWS = int(os.getenv("EXPORT_SHARD_ROWS", "5000"))
+EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", "8"))
+LINKIFY_ENDPOINT = os.getenv("LINKIFY_ENDPOINT")
+EXPORT_INCLUDE_URL = os.getenv("EXPORT_INCLUDE_URL", "0") == "1"   # payload'a kaynak "url" ekle
+
+# Detay fetch HTTP istemcisi: requests (HTTP/1.1) | http2 (httpx, opsiyonel bağımlılık)
+HTTP_BACKEND = os.getenv("HTTP_BACKEND", "requests").lower()
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))   # origin başına eşzamanlı istek
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+
+# Çoklu detay worker'ı: lease ile satır sahiplenme (sql/001_detail_leases.sql gerekli)
+DETAIL_CLAIM = os.getenv("DETAIL_CLAIM", "0") == "1"
+DETAIL_LEASE_SECONDS = int(os.getenv("DETAIL_LEASE_SECONDS", "600"))
+WORKER_ID = os.getenv("WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+# Detay öncelik sırası + run bütçesi (sql/002_detail_priority.sql gerekli). 0 -> sınırsız
+DETAIL_SCHEDULER = os.getenv("DETAIL_SCHEDULER", "0") == "1"
+DETAIL_BUDGET_SECONDS = float(os.getenv("DETAIL_BUDGET_SECONDS", "0"))
+DETAIL_BUDGET_REQUESTS = int(os.getenv("DETAIL_BUDGET_REQUESTS", "0"))
+DETAIL_FRESH_HOURS = int(os.getenv("DETAIL_FRESH_HOURS", "24"))
+# Scheduler: sonuç çıkmayan satır bekleyen kalır, DETAIL_RETRY_SECONDS sonra tekrar denenir;
+# DETAIL_MAX_ATTEMPTS denemeden sonra vazgeçilir (detail_checked=true)
+DETAIL_MAX_ATTEMPTS = int(os.getenv("DETAIL_MAX_ATTEMPTS", "3"))
+DETAIL_RETRY_SECONDS = int(os.getenv("DETAIL_RETRY_SECONDS", "3600"))
+
+# Detay fetch/parse pipeline: parse ayrı process pool'da (0 -> eski sıralı akış)
+DETAIL_FETCH_WORKERS = int(os.getenv("DETAIL_FETCH_WORKERS", "4"))
+DETAIL_PARSE_WORKERS = int(os.getenv("DETAIL_PARSE_WORKERS", "0"))
+
+# Selector deneme/isabet istatistikleri; hiç tutmayan selector atlanır (boş -> diske yazma)
+SELECTOR_STATS_PATH = os.getenv("SELECTOR_STATS_PATH", ".selector_stats.json")
+
+# Ham HTML arşivi + MODE=reextract (network'süz yeniden çıkarım)
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "0") == "1"
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+REEXTRACT_WORKERS = int(os.getenv("REEXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+REEXTRACT_UPSERT_BATCH = int(os.getenv("REEXTRACT_UPSERT_BATCH", "500"))
+
+# MODE=reprocess: tüm tabloya transform uygula (keywords, titles; virgülle birden fazla)
+REPROCESS_TRANSFORMS = [x.strip() for x in os.getenv("REPROCESS_TRANSFORM", "keywords").split(",") if x.strip()]
+REPROCESS_WORKERS = int(os.getenv("REPROCESS_WORKERS", "0")) or os.cpu_count() or 1
+REPROCESS_PAGE_SIZE = int(os.getenv("REPROCESS_PAGE_SIZE", "1000"))
+REPROCESS_SITE = os.getenv("REPROCESS_SITE") or None
+
 
 # -------------------------
 # URL HELPERS
 # -------------------------
 def normalize_url(url: str) -> str:
-    """utm vb. query/fragment sil, normalize et."""
-    try:
-        u = urlparse(url)
-        clean = u._replace(query="", fragment="")
-        return urlunparse(clean)
-    except Exception:
-        return url
+    """utm vb. query/fragment sil, site kurallarına göre kanonik hale getir."""
+    return canonical_url(url)
 
 
 def same_domain(url: str, domain: str) -> bool:
@@ -84,169 +143,99 @@ def same_domain(url: str, domain: str) -> bool:
         return False
 
 
-def is_valid_dentway_article_url(url: str) -> bool:
-    bad = ["whatsapp.com", "goo.gl/maps", "tel:", "mailto:", "facebook.com", "instagram.com"]
-    if any(x in url for x in bad):
-        return False
-    if not same_domain(url, "dentway.com.tr"):
-        return False
-
-    path = (urlparse(url).path or "").rstrip("/")
-    if path == "/blog":
-        return False
+# -------------------------
+# URL RULES
+# -------------------------
+BAD_URL_PARTS = ("whatsapp.com", "goo.gl/maps", "tel:", "mailto:", "facebook.com", "instagram.com")
+
+URL_RULES = {
+    "Dentway": {
+        "domain": "dentway.com.tr",
+        "blocked_substrings": BAD_URL_PARTS,
+        # sadece blog istiyorsan /tedavi devre dışı
+        "allowed_prefixes": ("/blog/",) if DENTWAY_ONLY_BLOG else ("/blog/", "/tedavi/"),
+        "blocked_prefixes": ("/blog/page/", "/kategori/", "/doktor/", "/hekimlerimiz/", "/hakkimizda/", "/kvkk"),
+        "blocked_exact": {"/blog"},
+    },
+    "Florence": {
+        "domain": "florence.com.tr",
+        "blocked_substrings": BAD_URL_PARTS,
+        "allowed_prefixes": ("/guncel-saglik/",),
+        "blocked_exact": {"/guncel-saglik"},
+    },
+    "ClinicWise": {
+        "domain": "clinic-wise.com",
+        "blocked_substrings": BAD_URL_PARTS,
+        # ❌ kategori / sayfalama / wp içeriği
+        "blocked_prefixes": (
+            "/blog/page/",
+            "/category/",
+            "/tag/",
+            "/author/",
+            "/wp-json/",
+            "/wp-content/",
+            "/wp-admin/",
+        ),
+        # boş, ana sayfa, blog listesi + ❌ BLOG OLMAYAN KESİN SAYFALAR
+        "blocked_exact": {
+            "", "/", "/blog",
+            "/about",
+            "/contact",
+            "/privacy-policy",
+            "/patient-stories",
+            "/patient-journey-guide",
+            "/medical-library",
+            "/become-a-partner",
+            "/become-an-influencer",
+            "/before-after-photos-in-turkey",
+            "/start-your-treatment-plan-easily",
+        },
+        # ✅ URL uzunluğu: landing page’leri elemek için
+        "min_path_len": 25,
+    },
+}
 
-    # sadece blog istiyorsan /tedavi devre dışı
-    if DENTWAY_ONLY_BLOG:
-        allowed_prefixes = ("/blog/",)
-    else:
-        allowed_prefixes = ("/blog/", "/tedavi/")
+URL_CLASSIFIERS = {site: UrlClassifier(rules) for site, rules in URL_RULES.items()}
 
-    if not (path + "/").startswith(allowed_prefixes):
-        return False
 
-    blocked_prefixes = ("/blog/page/", "/kategori/", "/doktor/", "/hekimlerimiz/", "/hakkimizda/", "/kvkk")
-    if any((path + "/").startswith(bp) for bp in blocked_prefixes):
-        return False
-
-    return True
+def is_valid_dentway_article_url(url: str) -> bool:
+    return URL_CLASSIFIERS["Dentway"](url)
 
 
 def is_valid_florence_article_url(url: str) -> bool:
-    bad = ["whatsapp.com", "goo.gl/maps", "tel:", "mailto:", "facebook.com", "instagram.com"]
-    if any(x in url for x in bad):
-        return False
-    if not same_domain(url, "florence.com.tr"):
-        return False
-
-    path = (urlparse(url).path or "").rstrip("/")
-    if not (path + "/").startswith("/guncel-saglik/"):
-        return False
-    if path == "/guncel-saglik":
-        return False
-    return True
+    return URL_CLASSIFIERS["Florence"](url)
 
 
 def is_valid_clinicwise_article_url(url: str) -> bool:
-    bad = [
-        "whatsapp.com", "goo.gl/maps", "tel:", "mailto:",
-        "facebook.com", "instagram.com"
-    ]
-    if any(x in url for x in bad):
-        return False
-
-    if not same_domain(url, "clinic-wise.com"):
-        return False
-
-    path = (urlparse(url).path or "").rstrip("/")
-
-    # boş, ana sayfa, blog listesi
-    if path in ("", "/", "/blog"):
-        return False
-
-    # ❌ BLOG OLMAYAN KESİN SAYFALAR
-    blocked_exact = {
-        "/about",
-        "/contact",
-        "/privacy-policy",
-        "/patient-stories",
-        "/patient-journey-guide",
-        "/medical-library",
-        "/become-a-partner",
-        "/become-an-influencer",
-        "/before-after-photos-in-turkey",
-        "/start-your-treatment-plan-easily",
-    }
-    if path in blocked_exact:
-        return False
-
-    # ❌ kategori / sayfalama / wp içeriği
-    blocked_prefixes = (
-        "/blog/page/",
-        "/category/",
-        "/tag/",
-        "/author/",
-        "/wp-json/",
-        "/wp-content/",
-        "/wp-admin/",
-    )
-    if any((path + "/").startswith(bp) for bp in blocked_prefixes):
-        return False
-
-    # ✅ URL uzunluğu: landing page’leri elemek için
-    if len(path) < 25:
-        return False
-
-    return True
+    return URL_CLASSIFIERS["ClinicWise"](url)
 
 
 # -------------------------
 # KEYWORD
 # -------------------------
-TR_STOPWORDS = {
-    "ve", "ile", "icin", "için", "da", "de", "ta", "te", "mi", "mı", "mu", "mü",
-    "bir", "bu", "şu", "o", "en", "cok", "çok", "gibi", "nedir", "nasil", "nasıl", "ne"
-}
-
-
 def keyword_from_title_or_slug(baslik: str | None, url: str) -> str:
-    # 1) Başlıktan üret
-    if baslik:
-        t = baslik.strip()
-        for sep in [" | ", " - ", " • ", " — ", " – "]:
-            if sep in t:
-                t = t.split(sep)[0].strip()
-                break
+    return keyword_for(baslik or None, url)
 
-        t = t.lower()
-        t = re.sub(r"[^\w\sçğıöşü-]", " ", t, flags=re.UNICODE)
-        t = t.replace("-", " ")
-        t = re.sub(r"\s+", " ", t).strip()
 
-        words = [w for w in t.split() if w not in TR_STOPWORDS and len(w) > 2]
-        if words:
-            return " ".join(words[:4]).title()
-        return t.title() if t else "Genel"
-
-    # 2) URL slug fallback
-    path = (urlparse(url).path or "").rstrip("/")
-    slug = path.split("/")[-1] if path else ""
-    slug = slug.replace("-", " ").replace("_", " ").strip().lower()
-    slug = re.sub(r"[^\w\sçğıöşü]", " ", slug, flags=re.UNICODE)
-    slug = re.sub(r"\s+", " ", slug).strip()
-
-    words = [w for w in slug.split() if w not in TR_STOPWORDS and len(w) > 2]
-    return (" ".join(words[:4]).title()) if words else (slug.title() if slug else "Genel")
-
-
-def build_linkify_payload(row: dict) -> dict | None:
-    """
-    Scraper DB kaydını alır
-    linkify_with_images endpointine %100 uyumlu payload üretir
-    """
-
-    # 1️⃣ ZORUNLU: TEXT
-    text = (row.get("icerik") or row.get("content") or "").strip()
-    if len(text) < 200:
-        return None
-
-    # 2️⃣ DOMAIN
-    site = row.get("site_adi")
-    domain = DOMAIN_MAP.get(site)
-    if not domain:
-        return None
-
-    # 3️⃣ TOPIC
-    topic = (
-        row.get("baslik")
-        or row.get("keyword")
-        or text.split(".")[0][:120]
-    )
+# -------------------------
+# SELENIUM SELECTORS
+# -------------------------
+# HTTP fast path selector'leri extract.DETAIL_SELECTORS içinde.
+SELENIUM_SELECTORS = {
+    "Dentway": {
+        "title": ["h1", ".blog-detail h1", ".entry-title", "article h1"],
+        "date": ["time", ".date", ".post-date", "article time"],
+    },
+    "Florence": {
+        "title": ["h1", ".page-title", ".news-detail h1", "article h1"],
+        "date": ["time", ".date", ".publish-date", "article time"],
+    },
+    "*": {
+        "title": ["h1", "article h1"],
+        "date": ["time", ".date"],
+    },
+}
 
-    return {
-        "text": text,
-        "topic": topic.strip(),
-        "domain": domain,
-    }
 
 # -------------------------
 # SCRAPER
@@ -275,11 +264,10 @@ class BlogScraper:
         self.driver = webdriver.Chrome(service=service, options=opts)
         self.wait = WebDriverWait(self.driver, 15)
 
-        self.http = requests.Session()
-        self.http.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
-        })
+        self.http = make_http_client(HTTP_BACKEND, HTTP_MAX_PER_HOST, HTTP_KEEPALIVE_SECONDS)
+        self.selectors = SelectorStats(SELECTOR_STATS_PATH or None)
+        self.archive = HtmlArchive(ARCHIVE_DIR) if ARCHIVE_ENABLED else None
+        self._parse_pool = None
 
     def _wait_ready(self, timeout=15) -> bool:
         end = time.time() + timeout
@@ -400,32 +388,57 @@ class BlogScraper:
                 out.append(u)
 
         return list(dict.fromkeys(out))
-    def collect_links_with_pagination(self, target: dict, max_pages=8) -> list[str]:
+    def collect_links_with_pagination(self, target: dict, max_pages=8, checkpoint: CrawlCheckpoint | None = None) -> list[str]:
         site = target["site"]
         list_url = target["list_url"]
-        all_links = []
+        # sıralı set: her sayfada tüm listeyi yeniden tekrarsızlaştırmaya gerek yok
+        all_links: dict[str, None] = dict(checkpoint.links) if checkpoint else {}
+
+        # ♻️ checkpoint'te toplama bitmişse tekrar gezme
+        if checkpoint and checkpoint.collected:
+            print(f"   ♻️ Checkpoint: toplama tamamlanmış, {len(all_links)} link diskten alındı")
+            return list(all_links)
+
+        def visit(page_url: str, links: list[str]) -> int:
+            before = len(all_links)
+            all_links.update(dict.fromkeys(links))
+            if checkpoint:
+                checkpoint.add_links(links)
+                checkpoint.mark_visited(page_url)
+            return len(all_links) - before
+
+        def skip(page_url: str) -> bool:
+            if checkpoint and checkpoint.is_visited(page_url):
+                print(f"   ⏭️ Checkpoint: zaten gezildi -> {page_url}")
+                return True
+            return False
 
         # ---------------- Dentway ----------------
         if site == "Dentway":
-            for i in range(1, max_pages + 1):
-                page_url = list_url if i == 1 else list_url.rstrip("/") + f"/page/{i}/"
-                links = self.collect_links_basic(page_url, scroll_steps=5)
+            pages = [list_url if i == 1 else list_url.rstrip("/") + f"/page/{i}/" for i in range(1, max_pages + 1)]
+            if checkpoint:
+                checkpoint.plan(pages)
 
-                before = len(all_links)
-                all_links.extend(links)
-                all_links = list(dict.fromkeys(all_links))
+            for i, page_url in enumerate(pages, start=1):
+                if skip(page_url):
+                    continue
+                links = self.collect_links_basic(page_url, scroll_steps=5)
+                added = visit(page_url, links)
 
-                print(f"   📄 Sayfa {i}: +{len(all_links) - before} yeni link")
-                if len(all_links) - before == 0 and i > 1:
+                print(f"   📄 Sayfa {i}: +{added} yeni link")
+                if added == 0 and i > 1:
                     break
 
         # ---------------- ClinicWise ----------------
         elif site == "ClinicWise":
-            self.driver.get(list_url)
-            self._wait_ready()
-            time.sleep(0.6)
-            self._try_accept_cookies()
-            all_links = self.collect_clinicwise_blog_links(scroll_steps=12)
+            if checkpoint:
+                checkpoint.plan([list_url])
+            if not skip(list_url):
+                self.driver.get(list_url)
+                self._wait_ready()
+                time.sleep(0.6)
+                self._try_accept_cookies()
+                visit(list_url, self.collect_clinicwise_blog_links(scroll_steps=12))
 
         # ---------------- Florence ----------------
         elif site == "Florence":
@@ -435,37 +448,41 @@ class BlogScraper:
                 "https://www.florence.com.tr/iletisim",
                 "https://www.florence.com.tr/insan-kaynaklari",
             ]
+            life_url = "https://www.florence.com.tr/florence-life"
+            if checkpoint:
+                checkpoint.plan(seed_pages + [life_url])
 
             # 🔹 Normal Florence sayfaları
             for seed in seed_pages:
+                if skip(seed):
+                    continue
                 print(f"   🌱 Florence seed: {seed}")
                 self.driver.get(seed)
                 self._wait_ready()
                 time.sleep(0.6)
                 self._try_accept_cookies()
 
-                before = len(all_links)
-                links = self.collect_florence_article_links()
-                all_links.extend(links)
-                all_links = list(dict.fromkeys(all_links))
-
-                print(f"      +{len(all_links) - before} makale linki")
+                added = visit(seed, self.collect_florence_article_links())
+                print(f"      +{added} makale linki")
 
             # 🔹 Florence Life (INFINITE SCROLL – TEK DOĞRU YÖNTEM)
-            print("   🌱 Florence Life infinite scroll")
-            life_links = self.collect_florence_life_links_scroll()
-            before = len(all_links)
-
-            all_links.extend(life_links)
-            all_links = list(dict.fromkeys(all_links))
-
-            print(f"      +{len(all_links) - before} Florence Life makale linki")
+            if not skip(life_url):
+                print("   🌱 Florence Life infinite scroll")
+                life_links = self.collect_florence_life_links_scroll()
+                added = visit(life_url, life_links)
+                print(f"      +{added} Florence Life makale linki")
 
         # ---------------- Default ----------------
         else:
-            all_links = self.collect_links_basic(list_url, scroll_steps=6)
+            if checkpoint:
+                checkpoint.plan([list_url])
+            if not skip(list_url):
+                visit(list_url, self.collect_links_basic(list_url, scroll_steps=6))
 
-        return all_links
+        if checkpoint:
+            checkpoint.mark_collected()
+
+        return list(all_links)
     
     def collect_florence_life_links_scroll(self, max_rounds=15) -> list[str]:
         url = "https://www.florence.com.tr/florence-life"
@@ -505,109 +522,202 @@ class BlogScraper:
         return list(all_links)
 
     # ---------- FAST HTML PARSE ----------
-    def _pick_first_text(self, soup: BeautifulSoup, selectors: list[str]) -> str | None:
-        for sel in selectors:
-            el = soup.select_one(sel)
-            if el:
-                txt = el.get_text(" ", strip=True)
-                if txt:
-                    return txt
-        return None
-
-    def _http_get_soup(self, url: str, timeout=12) -> BeautifulSoup | None:
+    def _http_get_html(self, url: str, timeout=12) -> bytes | None:
         try:
             time.sleep(random.uniform(0.10, 0.25))
             r = self.http.get(url, timeout=timeout)
             if r.status_code != 200:
                 return None
-            return BeautifulSoup(r.text, "html.parser")
+            if self.archive:
+                # ham yanıtı sakla: selector değişince MODE=reextract ile tekrar fetch'siz işlenir
+                self.archive.put(url, r.content, site=site_for_url(url), status=r.status_code)
+            return r.content
         except Exception:
             return None
 
     def scrape_detail_fast(self, site: str, url: str) -> tuple[str | None, str | None]:
-        soup = self._http_get_soup(url)
-        if not soup:
+        html = self._http_get_html(url)
+        if not html:
             return None, None
-
-        if site == "Dentway":
-            title = self._pick_first_text(soup, ["h1", ".entry-title", "article h1"])
-            date = self._pick_first_text(soup, ["time", ".date", ".post-date", "article time"])
-            return title, date
-
-        if site == "Florence":
-            title = self._pick_first_text(soup, ["h1", ".page-title", ".news-detail h1", "article h1"])
-            date = self._pick_first_text(soup, ["time", ".date", ".publish-date", "article time"])
-            return title, date
-
-        if site == "ClinicWise":
-            title = self._pick_first_text(
-                soup,
-                ["article h1", ".blog-title", "h1"]
-            )
-
-            # ❌ title yoksa veya çok kısa ise → içerik değildir
-            if not title or len(title) < 10:
-                return None, None
-
-            date = self._pick_first_text(
-                soup,
-                ["time", ".post-date", ".published-date"]
-            )
-            return title, date   # 🔥 EN ÖNEMLİ SATIR
-
-        # fallback (diğer siteler için)
-        title = self._pick_first_text(soup, ["h1", "article h1"])
-        date = self._pick_first_text(soup, ["time", ".date"])
-        return title, date
+        # önce <head> (JSON-LD / OpenGraph / meta), eksik kalırsa görünür elementler
+        return extract_detail_from_html(site, html, self.selectors)
 
 
     # ---------- SELENIUM FALLBACK ----------
-    def _safe_text(self, css_list: list[str]) -> str | None:
-        for css in css_list:
+    def _safe_text(self, css_list: list[str], site: str = "*", field: str = "") -> str | None:
+        for css in self.selectors.candidates(site, field, css_list):
             try:
                 el = self.driver.find_element(By.CSS_SELECTOR, css)
                 txt = (el.text or "").strip()
-                if txt:
-                    return txt
             except Exception:
-                continue
+                txt = ""
+            self.selectors.record(site, field, css, bool(txt))
+            if txt:
+                return txt
         return None
 
     def scrape_detail(self, site: str, url: str) -> tuple[str | None, str | None]:
+        title, date, _ = self.scrape_detail_with_source(site, url)
+        return title, date
+
+    def scrape_detail_with_source(self, site: str, url: str) -> tuple[str | None, str | None, bool]:
+        """(title, date, selenium_gerekti_mi)"""
         title, date = self.scrape_detail_fast(site, url)
         if title or date:
-            return title, date
+            return title, date, False
+
+        title, date = self._scrape_detail_browser(site, url)
+        return title, date, True
 
+    def _scrape_detail_browser(self, site: str, url: str) -> tuple[str | None, str | None]:
         try:
             self.driver.get(url)
             self._wait_ready()
             time.sleep(0.25)
             self._try_accept_cookies()
 
-            if site == "Dentway":
-                title = self._safe_text(["h1", ".blog-detail h1", ".entry-title", "article h1"])
-                date = self._safe_text(["time", ".date", ".post-date", "article time"])
-                return title, date
+            sels = SELENIUM_SELECTORS.get(site, SELENIUM_SELECTORS["*"])
+            key = site if site in SELENIUM_SELECTORS else "*"
+            title = self._safe_text(sels["title"], key, "selenium:title")
+            date = self._safe_text(sels["date"], key, "selenium:date")
+            return title, to_iso_date(date, date_order(site)) or date
+        except Exception:
+            return None, None
 
-            if site == "Florence":
-                title = self._safe_text(["h1", ".page-title", ".news-detail h1", "article h1"])
-                date = self._safe_text(["time", ".date", ".publish-date", "article time"])
-                return title, date
+    # ---------- FETCH / PARSE PIPELINE ----------
+    def _get_parse_pool(self) -> ProcessPoolExecutor | None:
+        """
+        Parse process pool'u (fork, bkz. process_pool.make_process_pool). Worker'lar fetch
+        thread'leri başlamadan (ilk batch'in başında) fork edilir. fork yoksa None -> sıralı akış.
+        """
+        if self._parse_pool is None:
+            if not fork_available():
+                print("⚠️ fork desteklenmiyor: parse pool kapalı, sıralı akış kullanılıyor.")
+                return None
+            self._parse_pool = make_process_pool(DETAIL_PARSE_WORKERS)
+        return self._parse_pool
+
+    def _drop_parse_pool(self):
+        """Worker öldüyse (ör. OOM) pool kalıcı bozuktur: bırak, sonraki batch yenisini kurar."""
+        if self._parse_pool is not None:
+            print("⚠️ Parse pool çöktü; bu batch bu process'te parse ediliyor.")
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+
+    def _submit_parse(self, site: str, html: bytes, snapshot: dict):
+        if self._parse_pool is None:
+            return None
+        try:
+            return self._parse_pool.submit(parse_detail_job, site, html, snapshot)
+        except BrokenProcessPool:
+            self._drop_parse_pool()
+            return None
 
-            title = self._safe_text(["h1", "article h1"])
-            date = self._safe_text(["time", ".date"])
-            return title, date
+    def _parse_result(self, site: str, html: bytes, fut) -> tuple[str | None, str | None]:
+        """Pool sonucunu al; pool yoksa ya da çöktüyse bu process'te parse et."""
+        if fut is not None:
+            try:
+                title, date, events = fut.result()
+                self.selectors.merge(events)
+                return title, date
+            except BrokenProcessPool:
+                self._drop_parse_pool()
+            except Exception:
+                return None, None
+        try:
+            return extract_detail_from_html(site, html, self.selectors)
         except Exception:
             return None, None
 
+    def scrape_details_batch(self, site: str, urls: list[str], budget: DetailBudget | None = None) -> dict[str, tuple]:
+        """
+        url -> (title, date, selenium_gerekti_mi). Bütçe biterse (fetch sırasında da kontrol edilir)
+        hiç fetch edilmeyen URL'ler sonuçta yer almaz; fast path'i boş dönüp Selenium'a bütçe kalmayanlar (None, None, None).
+
+        DETAIL_PARSE_WORKERS > 0 ise üç aşama:
+          1) fetch   : DETAIL_FETCH_WORKERS thread, ham bytes
+          2) parse   : process pool, bytes girer (title, date, selector kayıtları) çıkar (soup taşınmaz)
+          3) fallback: sonuç çıkmayanlar sırayla Selenium
+        """
+        results = {}
+        parse_pool = self._get_parse_pool() if DETAIL_PARSE_WORKERS > 0 else None
+        if parse_pool is None:
+            for url in urls:
+                if budget and budget.exhausted():
+                    break
+                title, date, used_browser = self.scrape_detail_with_source(site, url)
+                if budget:
+                    budget.spend(2 if used_browser else 1)
+                results[url] = (title, date, used_browser)
+            return results
+
+        # worker'lar ana process'in selector istatistiğiyle çalışır, kayıtlarını geri döndürür
+        snapshot = self.selectors.snapshot()
+        htmls = {}
+        parsed = {}
+        fetched_set = set()
+        with ThreadPoolExecutor(max_workers=DETAIL_FETCH_WORKERS) as fetch_pool:
+            fetches = {}
+            for url in urls:
+                if budget and budget.exhausted():
+                    break
+                if budget:
+                    budget.spend()
+                fetches[fetch_pool.submit(self._http_get_html, url)] = url
+
+            # parse, diğer fetch'ler ağda beklerken ayrı process'te başlar
+            for fut in as_completed(fetches):
+                if fut.cancelled():
+                    continue
+                url = fetches[fut]
+                fetched_set.add(url)
+                html = fut.result()
+                if html:
+                    htmls[url] = html
+                    parsed[url] = self._submit_parse(site, html, snapshot)
+                # süre bütçesi fetch sırasında da dolabilir: henüz başlamamış fetch'leri iptal et
+                if budget and budget.exhausted():
+                    for f in fetches:
+                        f.cancel()
+
+        fetched = [u for u in urls if u in fetched_set]
+        need_browser = []
+        for url in fetched:
+            title = date = None
+            if url in htmls:
+                title, date = self._parse_result(site, htmls[url], parsed.get(url))
+            if title or date:
+                results[url] = (title, date, False)
+            else:
+                need_browser.append(url)
+
+        for url in need_browser:
+            if budget and budget.exhausted():
+                # Selenium gerekiyor ama denenmedi: scheduler bunu bekleyen satıra yazar
+                results[url] = (None, None, None)
+                continue
+            if budget:
+                budget.spend()
+            title, date = self._scrape_detail_browser(site, url)
+            results[url] = (title, date, True)
+
+        return {u: results[u] for u in fetched if u in results}
+
     # ---------- DB HELPERS ----------
     def get_existing_urls_for_candidates(self, site_adi: str, candidate_urls: list[str]) -> set[str]:
         existing = set()
         if not candidate_urls:
             return existing
 
-        for i in range(0, len(candidate_urls), CHUNK_IN_LIMIT):
-            chunk = candidate_urls[i:i + CHUNK_IN_LIMIT]
+        # eski kayıtlar www./trailing slash farklı biçimde olabilir -> varyantları da sor
+        variant_of = {}
+        for u in candidate_urls:
+            for v in url_variants(u):
+                variant_of.setdefault(v, u)
+        lookup = list(variant_of)
+
+        for i in range(0, len(lookup), CHUNK_IN_LIMIT):
+            chunk = lookup[i:i + CHUNK_IN_LIMIT]
             try:
                 res = (
                     sb.table("articles")
@@ -619,37 +729,35 @@ class BlogScraper:
                 for r in (res.data or []):
                     u = r.get("url")
                     if u:
-                        existing.add(u)
+                        existing.add(variant_of.get(u, u))
             except Exception:
-                print(f"⚠️ DB in_ chunk sorgusu hata verdi (site={site_adi}, chunk={i}//{len(candidate_urls)})")
+                print(f"⚠️ DB in_ chunk sorgusu hata verdi (site={site_adi}, chunk={i}//{len(lookup)})")
 
         return existing
 
+    def get_site_urls(self, site_adi: str) -> list[str]:
+        """Sitenin DB'deki tüm URL'leri (id üzerinden keyset pagination, tek kolon)."""
+        urls = []
+        try:
+            for rows in iter_article_pages(sb, "id,url", 1000, 0, site_adi):
+                urls.extend(r["url"] for r in rows if r.get("url"))
+        except Exception as e:
+            print(f"⚠️ {site_adi}: kayıtlı URL'ler okunamadı, slug kontrolü sadece bu crawl'daki kayıtlı linklerle: {e}")
+        return urls
+
     # ---------- LINKS ONLY ----------
-    def scrape_site_links_only(self, target: dict) -> list[dict]:
+    def scrape_site_links_only(self, target: dict, checkpoint: CrawlCheckpoint | None = None) -> list[dict]:
         print(f"\n🔍 {target['site']} -> {target['list_url']}")
-        all_links = self.collect_links_with_pagination(target, max_pages=MAX_PAGES)
+        all_links = self.collect_links_with_pagination(target, max_pages=MAX_PAGES, checkpoint=checkpoint)
         print(f"🔗 Toplanan toplam link: {len(all_links)}")
 
-        candidate = []
-        for url in all_links:
-            if not same_domain(url, target["domain"]):
-                continue
-
-            if target["site"] == "Dentway":
-                if not is_valid_dentway_article_url(url):
-                    continue
-            elif target["site"] == "Florence":
-                if not is_valid_florence_article_url(url):
-                    continue
-            elif target["site"] == "ClinicWise":
-                if not is_valid_clinicwise_article_url(url):
-                    continue
-
-
-            candidate.append(url)
+        classifier = URL_CLASSIFIERS.get(target["site"])
+        if classifier:
+            valid = classifier.filter(all_links)
+        else:
+            valid = [u for u in all_links if same_domain(u, target["domain"])]
 
-        candidate = list(dict.fromkeys(candidate))
+        candidate = list(dict.fromkeys(canonical_url(u, target["site"]) for u in valid))
         print(f"🧹 Filtre sonrası aday link: {len(candidate)}")
 
         t0 = time.time()
@@ -659,12 +767,20 @@ class BlogScraper:
         new_links = [u for u in candidate if u not in existing]
         print(f"🧠 DB’de var: {len(existing)} | 🆕 Yeni makale: {len(new_links)}")
 
+        # 🧬 farklı path'lerden (/blog/ vs /tedavi/) erişilen aynı makaleyi detaya sokma.
+        # Slug indeksi sitenin DB'deki TÜM URL'lerinden kurulur (listeleme sayfalarından düşmüş olanlar dahil).
+        if CROSS_PATH_DEDUP and new_links:
+            known = [u for u in candidate if u in existing] + self.get_site_urls(target["site"])
+            new_links, dropped = drop_cross_path_duplicates(new_links, known)
+            for u, dup in dropped:
+                print(f"   🧬 Aynı slug farklı path'te, atlandı: {u} ~ {dup}")
+
         results = [{
             "site_adi": target["site"],
             "baslik": None,
             "url": u,
             "yayin_tarihi": None,
-            "keyword": keyword_from_title_or_slug(None, u),
+            "keyword": keyword_for(None, u),
             "detail_checked": False,  # ✅ yeni kayıt -> detay denenmemiş,
             "updated_at": datetime.utcnow().isoformat(),
 
@@ -675,8 +791,28 @@ class BlogScraper:
 
     # ✅ GEREKSİZ TEKRAR YOK:
     # sadece detail_checked=false olanları dene, sonra true yap.
-    def fill_missing_details(self, target: dict, batch_limit: int = 25) -> int:
-        site_adi = target["site"]
+    def _claim_pending_rows(self, site_adi: str, batch_limit: int) -> list[dict]:
+        """DETAIL_CLAIM=1 ise bu worker'a lease'li ayrık bir batch al, değilse düz select."""
+        if DETAIL_CLAIM:
+            params = {
+                "p_site": site_adi,
+                "p_worker": WORKER_ID,
+                "p_limit": batch_limit,
+                "p_lease_seconds": DETAIL_LEASE_SECONDS,
+            }
+            if DETAIL_SCHEDULER:
+                params["p_fresh_hours"] = DETAIL_FRESH_HOURS
+            res = sb.rpc("claim_article_details", params).execute()
+            return res.data or []
+
+        if DETAIL_SCHEDULER:
+            # öncelik sırası: taze > az denenmiş > fast path > en yeni (sql/002_detail_priority.sql)
+            res = sb.rpc("next_article_details", {
+                "p_site": site_adi,
+                "p_limit": batch_limit,
+                "p_fresh_hours": DETAIL_FRESH_HOURS,
+            }).execute()
+            return res.data or []
 
         res = (
             sb.table("articles")
@@ -686,98 +822,242 @@ class BlogScraper:
             .limit(batch_limit)
             .execute()
         )
-        rows = res.data or []
+        return res.data or []
+
+    def _complete_rows(self, updates: list[dict]) -> int:
+        if DETAIL_CLAIM:
+            # sadece lease'i hâlâ bizde olan satırlar yazılır
+            keys = ("url", "baslik", "yayin_tarihi", "keyword", "needs_browser", "detail_checked")
+            rows = []
+            for u in updates:
+                row = {k: u[k] for k in keys if k in u}
+                if not u["detail_checked"]:
+                    row["retry_seconds"] = DETAIL_RETRY_SECONDS
+                rows.append(row)
+            res = sb.rpc("complete_article_details", {"p_worker": WORKER_ID, "p_rows": rows}).execute()
+            written = res.data if isinstance(res.data, int) else len(updates)
+            if written < len(updates):
+                print(f"⚠️ {len(updates) - written} satırın lease'i dolmuş, sonuç yazılmadı.")
+            return written
+
+        sb.table("articles").upsert(updates, on_conflict="url").execute()
+        return len(updates)
+
+    def _release_rows(self, urls: list[str]):
+        """Sahiplenilip işlenmeyen satırları bırak (lease + claim'in artırdığı deneme geri alınır)."""
+        if not DETAIL_CLAIM or not urls:
+            return
+        try:
+            res = sb.rpc("release_article_details", {"p_worker": WORKER_ID, "p_urls": urls}).execute()
+            print(f"↩️ İşlenmeyen {res.data if isinstance(res.data, int) else len(urls)} satırın lease'i bırakıldı.")
+        except Exception as e:
+            print(f"⚠️ Lease bırakılamadı (süre dolunca geri döner): {e}")
+
+    def fill_missing_details(self, target: dict, batch_limit: int = 25, budget: DetailBudget | None = None) -> int:
+        site_adi = target["site"]
+
+        rows = self._claim_pending_rows(site_adi, batch_limit)
         if not rows:
             print(f"✅ {site_adi}: detay denenecek kayıt yok (detail_checked=false yok).")
             return 0
 
         print(f"🛠️ {site_adi}: detay denenecek kayıt: {len(rows)} (batch={batch_limit})")
 
+        # bütçe bittiyse kalan satırlar sonuçta olmaz; lease'liyse hemen geri bırakılır
+        results = self.scrape_details_batch(site_adi, [r["url"] for r in rows], budget)
+
         updates = []
+        unprocessed = []
+        now = datetime.utcnow()
         for idx, r in enumerate(rows, start=1):
             url = r["url"]
+            title, date, used_browser = results.get(url, (None, None, None))
+            if url not in results or (used_browser is None and not DETAIL_SCHEDULER):
+                unprocessed.append(url)
+                continue
             old_title = r.get("baslik")
             old_date = r.get("yayin_tarihi")
 
-            title, date = self.scrape_detail(site_adi, url)
-
             # tarih varsa yaz, yoksa NULL/eskisi kalsın
             final_title = title if title else old_title
             final_date = date if date else old_date
 
             kw = keyword_from_title_or_slug(final_title, url)
 
-            updates.append({
+            row = {
                 "site_adi": site_adi,
                 "url": url,
                 "baslik": final_title,
                 "yayin_tarihi": final_date,
                 "keyword": kw,
                 "detail_checked": True,   # ✅ denendi -> bir daha deneme,
-                "updated_at": datetime.utcnow().isoformat(),
-
-            })
-            print(f"➡️ ({idx}/{len(rows)}) Detay denendi: {url}")
-
-        sb.table("articles").upsert(updates, on_conflict="url").execute()
-        print(f"✅ {site_adi}: detay güncellendi (denendi): {len(updates)}")
+                "updated_at": now.isoformat(),
+
+            }
+            if DETAIL_SCHEDULER:
+                # claim deneme sayısını zaten artırdı; düz okumada burada artır
+                attempts = int(r.get("detail_attempts") or 0) + (0 if DETAIL_CLAIM else 1)
+                row["needs_browser"] = used_browser is not False
+                # sonuç yoksa bekleyen kal: sıralama attempts / needs_browser ile yapılır
+                if not (title or date) and attempts < DETAIL_MAX_ATTEMPTS:
+                    row["detail_checked"] = False
+                if not DETAIL_CLAIM:
+                    row["detail_attempts"] = attempts
+                    row["lease_until"] = (
+                        None if row["detail_checked"]
+                        else (now + timedelta(seconds=DETAIL_RETRY_SECONDS)).isoformat()
+                    )
+            updates.append(row)
+            state = "denendi" if row["detail_checked"] else "bekliyor"
+            print(f"➡️ ({idx}/{len(rows)}) Detay {state}: {url}")
+
+        self._release_rows(unprocessed)
+
+        if not updates:
+            return 0
+        written = self._complete_rows(updates)
+        print(f"✅ {site_adi}: detay güncellendi (denendi): {written}")
         return len(updates)
 
-    def save_to_supabase(self, rows: list[dict]):
+    def save_to_supabase(self, rows: list[dict]) -> bool:
         if not rows:
-            return
+            return True
 
         cleaned = [r for r in rows if r.get("url") and r.get("site_adi")]
         if not cleaned:
-            return
+            return True
 
         try:
             sb.table("articles").upsert(cleaned, on_conflict="url").execute()
             print(f"✅ Supabase'e yazıldı: {len(cleaned)}")
+            return True
         except Exception as e:
             print(f"❌ Supabase Hatası: {e}")
+            return False
 
     def close(self):
         try:
             self.driver.quit()
         except Exception:
             pass
+        try:
+            self.http.close()
+        except Exception:
+            pass
+        self.selectors.save()
+        if self.archive:
+            self.archive.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
 
 
 def backfill_missing_keywords(site_adi: str, batch_limit: int = 200) -> int:
-    res = (
-        sb.table("articles")
-        .select("url,site_adi,baslik,keyword")
-        .eq("site_adi", site_adi)
-        .is_("keyword", "null")
-        .limit(batch_limit)
-        .execute()
-    )
-    rows = res.data or []
-    if not rows:
-        print(f"✅ {site_adi}: keyword doldurulacak kayıt yok.")
-        return 0
-
-    updates = []
-    for r in rows:
-        url = r["url"]
-        baslik = r.get("baslik")
-        kw = keyword_from_title_or_slug(baslik, url)
-       # updates.append({"site_adi": site_adi, "url": url, "keyword": kw})
-        updates.append({
+    """keyword'ü NULL olan tüm satırları id üzerinden sayfalayarak doldur."""
+    total = 0
+    after_id = 0
+    while True:
+        res = (
+            sb.table("articles")
+            .select("id,url,site_adi,baslik,keyword")
+            .eq("site_adi", site_adi)
+            .is_("keyword", "null")
+            .gt("id", after_id)
+            .order("id")
+            .limit(batch_limit)
+            .execute()
+        )
+        rows = res.data or []
+        if not rows:
+            break
+
+        now = datetime.utcnow().isoformat()
+        updates = [{
             "site_adi": site_adi,
-            "url": url,
+            "url": r["url"],
             "keyword": kw,
-            "updated_at": datetime.utcnow().isoformat(),
-        })
+            "updated_at": now,
+        } for r, kw in zip(rows, keywords_for_rows(rows))]
+
+        sb.table("articles").upsert(updates, on_conflict="url").execute()
+        total += len(updates)
+        after_id = rows[-1]["id"]
+        if len(rows) < batch_limit:
+            break
+
+    if not total:
+        print(f"✅ {site_adi}: keyword doldurulacak kayıt yok.")
+    else:
+        print(f"✅ {site_adi}: keyword güncellendi: {total}")
+    return total
+
+
+def export_linkify_payloads() -> dict:
+    """MODE=export: tüm articles tablosunu linkify payload'larına çevir."""
+    exporter = LinkifyExporter(
+        sb,
+        partial(build_linkify_payload, include_url=EXPORT_INCLUDE_URL),
+        mode=EXPORT_MODE,
+        out_dir=EXPORT_DIR,
+        endpoint=LINKIFY_ENDPOINT,
+        page_size=EXPORT_PAGE_SIZE,
+        shard_rows=EXPORT_SHARD_ROWS,
+        concurrency=EXPORT_CONCURRENCY,
+    )
+    return exporter.run()
 
 
-    sb.table("articles").upsert(updates, on_conflict="url").execute()
-    print(f"✅ {site_adi}: keyword güncellendi: {len(updates)}")
-    return len(updates)
+def reextract_from_archive() -> int:
+    """MODE=reextract: arşivdeki ham HTML'den title/date'i yeniden çıkar, DB'ye yaz."""
+    total = 0
+    for site_adi, results in reextract_archive(ARCHIVE_DIR, workers=REEXTRACT_WORKERS):
+        now = datetime.utcnow().isoformat()
+        rows = []
+        for url, title, date in results:
+            if not title and not date:
+                continue
+            row = {"site_adi": site_adi, "url": url, "updated_at": now}
+            if title:
+                row["baslik"] = title
+                row["keyword"] = keyword_from_title_or_slug(title, url)
+            if date:
+                row["yayin_tarihi"] = date
+            rows.append(row)
+
+        written = upsert_in_batches(sb, rows, REEXTRACT_UPSERT_BATCH)
+        total += written
+        print(f"✅ {site_adi}: yeniden çıkarılan kayıt: {written}")
+    return total
+
+
+def reprocess_articles() -> int:
+    """MODE=reprocess: REPROCESS_TRANSFORM'u tüm articles tablosuna uygula."""
+    total = 0
+    for name in REPROCESS_TRANSFORMS:
+        total += Reprocessor(
+            sb,
+            name,
+            workers=REPROCESS_WORKERS,
+            page_size=REPROCESS_PAGE_SIZE,
+            upsert_batch=REEXTRACT_UPSERT_BATCH,
+            state_dir=CHECKPOINT_DIR,
+            site_adi=REPROCESS_SITE,
+        ).run()
+    return total
 
 
 def run():
+    if MODE == "export":
+        export_linkify_payloads()
+        return
+
+    if MODE == "reextract":
+        reextract_from_archive()
+        return
+
+    if MODE == "reprocess":
+        reprocess_articles()
+        return
+
     targets = [
         {"site": "Dentway", "domain": "dentway.com.tr", "list_url": "https://www.dentway.com.tr/blog/"},
         {"site": "Florence", "domain": "florence.com.tr", "list_url": "https://www.florence.com.tr/guncel-saglik"},
@@ -785,32 +1065,48 @@ def run():
     ]
 
     scraper = BlogScraper(headless=HEADLESS)
+    budget = DetailBudget(seconds=DETAIL_BUDGET_SECONDS, requests=DETAIL_BUDGET_REQUESTS)
+    run_details = MODE == "details" or (MODE == "auto" and AUTO_DETAILS)
 
     try:
         for t in targets:
             # MODE=keywords -> sadece keyword işi
             if MODE == "keywords":
-                for _ in range(DETAIL_ROUNDS):
-                    k = backfill_missing_keywords(t["site"], batch_limit=200)
-                    if k == 0:
-                        break
+                backfill_missing_keywords(t["site"], batch_limit=200)
                 continue
 
             # links
             if MODE in ("auto", "links"):
-                rows = scraper.scrape_site_links_only(t)
-                scraper.save_to_supabase(rows)
-
-            # details
-            if MODE in ("auto", "details"):
-                if MODE == "auto" and not AUTO_DETAILS:
-                    continue
-
+                ckpt = None
+                if CHECKPOINT_ENABLED:
+                    ckpt = CrawlCheckpoint(t["site"], directory=CHECKPOINT_DIR, flush_every=CHECKPOINT_FLUSH_EVERY)
+                    if ckpt.resumed:
+                        print(f"♻️ {t['site']}: checkpoint bulundu, kaldığı yerden devam "
+                              f"({len(ckpt.visited)} sayfa gezilmiş, {len(ckpt.links)} link bekliyor)")
+
+                rows = scraper.scrape_site_links_only(t, checkpoint=ckpt)
+                # DB'ye yazıldıysa checkpoint'e gerek kalmadı
+                if ckpt:
+                    ckpt.commit(lambda: scraper.save_to_supabase(rows))
+                else:
+                    scraper.save_to_supabase(rows)
+
+            # details (scheduler kapalıysa site site, DETAIL_ROUNDS tur)
+            if run_details and not DETAIL_SCHEDULER:
                 for _ in range(DETAIL_ROUNDS):
-                    filled = scraper.fill_missing_details(t, batch_limit=DETAIL_BATCH_LIMIT)
-                    if filled == 0:
+                    filled = scraper.fill_missing_details(t, batch_limit=DETAIL_BATCH_LIMIT, budget=budget)
+                    if filled == 0 or budget.exhausted():
                         break
 
+        # details (scheduler): öncelik sırasıyla, siteler arası adil, bütçe bitene kadar
+        if run_details and DETAIL_SCHEDULER:
+            done = run_fair(
+                targets,
+                lambda t: scraper.fill_missing_details(t, batch_limit=DETAIL_BATCH_LIMIT, budget=budget),
+                budget,
+            )
+            print(f"📊 Detay özeti: {done} ({budget})")
+
     finally:
         print("\n⌛ Bitti. Tarayıcı kapanıyor...")
         scraper.close()
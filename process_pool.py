@@ -0,0 +1,22 @@
+# process_pool.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def make_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    CPU işleri (parse, reprocess, reextract) için process pool.
+
+    fork varsa fork kullanılır: spawn/forkserver worker'ları main.py'yi yeniden import edip
+    her biri kendi Supabase client'ını kurardı. Worker'lar burada hepsi birden başlatılır,
+    böylece fork, çağıranın sonradan açacağı thread'lerden önce yapılır.
+    fork yoksa platform varsayılanına düşülür.
+    """
+    ctx = multiprocessing.get_context("fork") if fork_available() else None
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    pool.submit(int).result()   # worker'ları şimdi başlat
+    return pool
@@ -0,0 +1,56 @@
+# reextract.py
+import time
+
+from archive import HtmlArchive, read_record
+from canonical import site_for_url
+from extract import extract_detail_from_html
+from process_pool import make_process_pool
+
+
+def _reextract_chunk(args) -> list[tuple[str, str | None, str | None]]:
+    """Worker: kayıtları diskten kendisi okur, sadece küçük (url, title, date) döndürür."""
+    directory, site, entries = args
+    out = []
+    for url, seg, offset, length in entries:
+        try:
+            html = read_record(directory, seg, offset, length)
+            title, date = extract_detail_from_html(site, html)
+        except Exception:
+            title, date = None, None
+        out.append((url, title, date))
+    return out
+
+
+def reextract_archive(directory: str, workers: int = 4, chunk_size: int = 64):
+    """
+    Arşivdeki her URL'nin son yanıtı üzerinde detay çıkarımını process pool ile
+    yeniden çalıştırır. Network kullanılmaz.
+
+    yield: (site_adi, [(url, title, date), ...])  -- site başına bir kez
+    """
+    archive = HtmlArchive(directory)
+    entries = archive.latest_entries()
+    if not entries:
+        print(f"⚠️ Arşiv boş: {directory}")
+        return
+
+    by_site: dict[str, list[tuple]] = {}
+    for url, e in entries.items():
+        if e.get("status", 200) != 200:
+            continue
+        site = e.get("site") or site_for_url(url)
+        if not site:
+            continue
+        by_site.setdefault(site, []).append((url, e["seg"], e["offset"], e["length"]))
+
+    print(f"🗃️ Arşivden yeniden çıkarım: {sum(len(v) for v in by_site.values())} URL, {workers} process")
+
+    with make_process_pool(workers) as pool:
+        for site, items in by_site.items():
+            t0 = time.time()
+            chunks = [(directory, site, items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)]
+            results = []
+            for part in pool.map(_reextract_chunk, chunks):
+                results.extend(part)
+            print(f"   ⚙️ {site}: {len(results)} sayfa, {time.time() - t0:.1f}s")
+            yield site, results
@@ -0,0 +1,159 @@
+# reprocess.py
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from extract import clean_title
+from keywords import keyword_for
+from process_pool import make_process_pool
+
+
+# -------------------------
+# KEYSET PAGINATION
+# -------------------------
+def iter_article_pages(sb, columns: str = "*", page_size: int = 1000, after_id: int = 0, site_adi: str | None = None):
+    """articles tablosunu id > after_id üzerinden sayfa sayfa akıt (OFFSET yok)."""
+    while True:
+        q = sb.table("articles").select(columns).gt("id", after_id)
+        if site_adi:
+            q = q.eq("site_adi", site_adi)
+        rows = q.order("id").limit(page_size).execute().data or []
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        after_id = rows[-1]["id"]
+
+
+def upsert_in_batches(sb, rows: list[dict], batch_size: int = 500) -> int:
+    """
+    Satırları kolon kümesine göre gruplayıp batch'ler halinde upsert et;
+    böylece her satır sadece verilen kolonlara dokunur.
+    """
+    groups: dict[tuple, list[dict]] = {}
+    for r in rows:
+        groups.setdefault(tuple(sorted(r)), []).append(r)
+
+    written = 0
+    for group in groups.values():
+        for i in range(0, len(group), batch_size):
+            chunk = group[i:i + batch_size]
+            sb.table("articles").upsert(chunk, on_conflict="url").execute()
+            written += len(chunk)
+    return written
+
+
+# -------------------------
+# TRANSFORMS
+# -------------------------
+# row -> değişen kolonlar (dict) ya da None. Process pool'da çalışır: top-level olmalı.
+def transform_keywords(row: dict) -> dict | None:
+    kw = keyword_for(row.get("baslik") or None, row["url"])
+    return {"keyword": kw} if kw != row.get("keyword") else None
+
+
+def transform_titles(row: dict) -> dict | None:
+    t = clean_title(row.get("baslik"), row.get("site_adi"))
+    if t == row.get("baslik"):
+        return None
+    # başlık değişince keyword de ona göre
+    return {"baslik": t, "keyword": keyword_for(t, row["url"])}
+
+
+TRANSFORMS = {
+    "keywords": (transform_keywords, "id,url,site_adi,baslik,keyword"),
+    "titles": (transform_titles, "id,url,site_adi,baslik,keyword"),
+}
+
+
+def _apply_chunk(args) -> list[dict]:
+    name, rows = args
+    fn = TRANSFORMS[name][0]
+    out = []
+    for r in rows:
+        try:
+            changed = fn(r)
+        except Exception:
+            changed = None
+        if changed:
+            out.append({"site_adi": r["site_adi"], "url": r["url"], **changed})
+    return out
+
+
+# -------------------------
+# RUNNER
+# -------------------------
+class Reprocessor:
+    """
+    Tüm articles tablosunu keyset pagination ile okuyup bir transform'u
+    process pool'da uygular, değişen satırları batch upsert ile geri yazar.
+    İlerleme (son id) <state_dir>/reprocess-<transform>.json içinde tutulur.
+    """
+
+    def __init__(self, sb, transform: str, workers: int = 4, page_size: int = 1000,
+                 chunk_size: int = 250, upsert_batch: int = 500, state_dir: str = ".checkpoints",
+                 site_adi: str | None = None):
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Bilinmeyen transform: {transform} (seçenekler: {', '.join(TRANSFORMS)})")
+        self.sb = sb
+        self.transform = transform
+        self.workers = max(1, workers)
+        self.page_size = page_size
+        self.chunk_size = chunk_size
+        self.upsert_batch = upsert_batch
+        self.site_adi = site_adi
+        suffix = f"-{site_adi.lower()}" if site_adi else ""
+        self.state_path = os.path.join(state_dir, f"reprocess-{transform}{suffix}.json")
+
+    def _load_last_id(self) -> int:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("last_id") or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _save_last_id(self, last_id: int):
+        directory = os.path.dirname(self.state_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".reprocess-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"last_id": last_id, "updated_at": time.time()}, f)
+        os.replace(tmp, self.state_path)
+
+    def run(self) -> int:
+        columns = TRANSFORMS[self.transform][1]
+        last_id = self._load_last_id()
+        if last_id:
+            print(f"♻️ Reprocess '{self.transform}' kaldığı yerden devam: id > {last_id}")
+
+        t0 = time.time()
+        seen = changed = 0
+        with make_process_pool(self.workers) as pool:
+            for rows in iter_article_pages(self.sb, columns, self.page_size, last_id, self.site_adi):
+                chunks = [(self.transform, rows[i:i + self.chunk_size]) for i in range(0, len(rows), self.chunk_size)]
+                updates = [u for part in pool.map(_apply_chunk, chunks) for u in part]
+
+                if updates:
+                    now = datetime.utcnow().isoformat()
+                    for u in updates:
+                        u["updated_at"] = now
+                    upsert_in_batches(self.sb, updates, self.upsert_batch)
+
+                seen += len(rows)
+                changed += len(updates)
+                last_id = rows[-1]["id"]
+                self._save_last_id(last_id)
+                print(f"🔁 {self.transform}: id<={last_id} | okunan {seen} | güncellenen {changed} "
+                      f"| {seen / max(time.time() - t0, 1e-6):,.0f} satır/s")
+
+        # tam tur bitti: bir sonraki çalıştırma baştan başlasın
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+
+        print(f"✅ Reprocess '{self.transform}' bitti: {seen} satır, {changed} güncellendi, {time.time() - t0:.1f}s")
+        return changed
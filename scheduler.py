@@ -0,0 +1,56 @@
+# scheduler.py
+import time
+
+
+class DetailBudget:
+    """
+    Bir run'ın detay işi için süre / istek bütçesi. 0 -> sınırsız.
+    İstek sayısı: HTTP fetch + Selenium sayfa yüklemesi.
+    """
+
+    def __init__(self, seconds: float = 0, requests: int = 0):
+        self.seconds = seconds
+        self.requests = requests
+        self.started = time.time()
+        self.used = 0
+
+    def spend(self, n: int = 1):
+        self.used += n
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def exhausted(self) -> bool:
+        if self.seconds and self.elapsed() >= self.seconds:
+            return True
+        if self.requests and self.used >= self.requests:
+            return True
+        return False
+
+    def __str__(self) -> str:
+        s = f"{self.elapsed():.0f}s" + (f"/{self.seconds:.0f}s" if self.seconds else "")
+        r = f"{self.used}" + (f"/{self.requests}" if self.requests else "")
+        return f"süre {s}, istek {r}"
+
+
+def run_fair(targets: list[dict], step, budget: DetailBudget) -> dict[str, int]:
+    """
+    Siteler arasında round-robin: her turda her siteye bir batch (step(target) -> işlenen sayı).
+    İşi biten site (0 döndüren) turdan çıkar; bütçe bitince durulur.
+    Böylece büyük backlog'u olan bir site diğerlerinin taze makalelerini bekletmez.
+    """
+    done = {t["site"]: 0 for t in targets}
+    active = list(targets)
+
+    while active and not budget.exhausted():
+        for t in list(active):
+            if budget.exhausted():
+                break
+            n = step(t)
+            done[t["site"]] += n
+            if n == 0:
+                active.remove(t)
+
+    if budget.exhausted():
+        print(f"⏳ Detay bütçesi doldu ({budget}); kalan iş sonraki run'a.")
+    return done
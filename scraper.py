@@ -4,44 +4,16 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 import time
-import re
-from urllib.parse import urlparse, unquote
 
+from canonical import canonical_url
+from keywords import keyword_for, slug_words
 
-TR_STOPWORDS = {
-    "ve","ile","icin","için","da","de","ta","te","mi","mı","mu","mü",
-    "bir","bu","şu","o","en","cok","çok","gibi","nedir","nasil","nasıl",
-    "ne","kadar","var","yok"
-}
-
-def _clean_text(s: str) -> str:
-    s = unquote(s or "").strip().lower()
-    s = re.sub(r"[^\w\sçğıöşü-]", " ", s, flags=re.UNICODE)
-    s = s.replace("-", " ").replace("_", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
 
 def _slug_from_url(url: str) -> str:
-    path = urlparse(url).path.rstrip("/")
-    slug = path.split("/")[-1] if path else ""
-    return _clean_text(slug)
+    return " ".join(slug_words(url))
 
 def generate_keyword(baslik: str, url: str) -> str:
-    # 1) Başlık varsa onu kullan (kısa/temiz)
-    t = _clean_text(baslik)
-    if t:
-        words = [w for w in t.split() if w not in TR_STOPWORDS and len(w) > 2]
-        if not words:
-            words = t.split()
-        return " ".join(words[:4]).title()
-
-    # 2) Başlık yoksa URL slug fallback
-    slug = _slug_from_url(url)
-    if slug:
-        words = [w for w in slug.split() if w not in TR_STOPWORDS and len(w) > 2]
-        return " ".join(words[:4]).title() if words else slug.title()
-
-    return "Genel"
+    return keyword_for(baslik or None, url)
 
 def make_driver(headless: bool = False):
     options = webdriver.ChromeOptions()
@@ -83,7 +55,7 @@ def get_dentway_blog_items(headless: bool = False):
         if "/blog/page/" in href:
             continue
 
-        clean_url = href.split("?")[0].split("#")[0].rstrip("/")
+        clean_url = canonical_url(href, "Dentway")
 
         # anchor text bazen başlık olur
         txt = (a.text or "").strip()
@@ -0,0 +1,143 @@
+# selector_stats.py
+import json
+import os
+import tempfile
+
+import soupsieve as sv
+
+
+class SelectorStats:
+    """
+    Site + alan (title/date) bazında her CSS selector'ün kaç kez denenip kaç kez eşleştiğini hatırlar.
+
+    - Selector'ler HER ZAMAN verilen (yapılandırılmış) sırada denenir: listeler örtüşür
+      (h1, article h1'in üst kümesi) ve sıra önceliği belirler; istatistik sırayı değiştirmez
+    - stale_after denemedir hiç eşleşmemiş selector, sadece listede tutan tüm selector'lerin
+      ARKASINDAYSA atlanır (öndeki spesifik bir selector hiçbir zaman atlanmaz, yoksa arkadaki
+      genel selector onun yerine kazanırdı); her probe_every çağrıda bir tüm liste denenir
+    - CSS string'leri bir kez derlenir (soupsieve), her çağrıda tekrar parse edilmez
+    - İstatistikler JSON olarak diske yazılır, sonraki run'da kaldığı yerden devam eder
+    - Process pool worker'ları snapshot() ile başlar, kayıtlarını `events`'e de yazar;
+      ana process bunları merge() ile kendi (kalıcı) istatistiğine işler
+    """
+
+    def __init__(self, path: str | None = ".selector_stats.json", stale_after: int = 200,
+                 probe_every: int = 50, save_every: int = 200):
+        self.path = path
+        self.stale_after = stale_after
+        self.probe_every = max(1, probe_every)
+        self.save_every = max(1, save_every)
+
+        # key -> selector -> [deneme, isabet]
+        self._stats: dict[str, dict[str, list[int]]] = {}
+        self._calls: dict[str, int] = {}
+        self._compiled: dict[str, object] = {}
+        self._dirty = 0
+        # None değilse her record() (site, field, selector, hit) olarak buraya da eklenir
+        self.events: list[tuple] | None = None
+        self._load()
+
+    # ---------- ORDER ----------
+    @staticmethod
+    def _key(site: str, field: str) -> str:
+        return f"{site}:{field}"
+
+    def _is_stale(self, stats: dict, selector: str) -> bool:
+        tries, hits = stats.get(selector, (0, 0))
+        return hits == 0 and tries >= self.stale_after
+
+    def candidates(self, site: str, field: str, selectors: list[str]) -> list[str]:
+        """Denenecek selector'ler: verilen sırada; tutanların arkasındaki hiç tutmayanlar (probe turu hariç) çıkarılmış."""
+        key = self._key(site, field)
+        calls = self._calls[key] = self._calls.get(key, 0) + 1
+        if calls % self.probe_every == 0:
+            return selectors
+
+        stats = self._stats.get(key)
+        if not stats:
+            return selectors
+
+        last_hit = -1
+        for i, s in enumerate(selectors):
+            if stats.get(s, (0, 0))[1]:
+                last_hit = i
+        keep = [s for i, s in enumerate(selectors) if i <= last_hit or not self._is_stale(stats, s)]
+        return keep or selectors
+
+    def record(self, site: str, field: str, selector: str, hit: bool = True):
+        entry = self._stats.setdefault(self._key(site, field), {}).setdefault(selector, [0, 0])
+        entry[0] += 1
+        if hit:
+            entry[1] += 1
+        if self.events is not None:
+            self.events.append((site, field, selector, hit))
+
+        self._dirty += 1
+        if self._dirty >= self.save_every:
+            self.save()
+
+    # ---------- POOL ----------
+    def snapshot(self) -> dict:
+        """Worker'lara gönderilecek (picklable) istatistik kopyası."""
+        return {key: {sel: list(v) for sel, v in per.items()} for key, per in self._stats.items()}
+
+    def load_snapshot(self, data: dict):
+        self._stats = {key: {sel: list(v) for sel, v in per.items()} for key, per in data.items()}
+
+    def merge(self, events: list[tuple]):
+        """Worker'dan dönen (site, field, selector, hit) kayıtlarını işle."""
+        for site, field, selector, hit in events:
+            self.record(site, field, selector, hit)
+
+    # ---------- MATCH ----------
+    def compiled(self, selector: str):
+        pat = self._compiled.get(selector)
+        if pat is None:
+            try:
+                pat = sv.compile(selector)
+            except Exception:
+                pat = False
+            self._compiled[selector] = pat
+        return pat
+
+    def pick_text(self, soup, site: str, field: str, selectors: list[str]) -> str | None:
+        for sel in self.candidates(site, field, selectors):
+            pat = self.compiled(sel)
+            if not pat:
+                continue
+            el = pat.select_one(soup)
+            txt = el.get_text(" ", strip=True) if el else ""
+            self.record(site, field, sel, bool(txt))
+            if txt:
+                return txt
+        return None
+
+    # ---------- PERSIST ----------
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # eski (skor) biçimli kayıtlar yok sayılır
+            self._stats = {
+                key: {sel: [int(v[0]), int(v[1])] for sel, v in per.items() if isinstance(v, list) and len(v) == 2}
+                for key, per in data.items() if isinstance(per, dict)
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Selector istatistikleri okunamadı ({self.path}): {e}")
+
+    def save(self):
+        self._dirty = 0
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".selstats-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._stats, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"⚠️ Selector istatistikleri yazılamadı ({self.path}): {e}")
@@ -0,0 +1,69 @@
+-- 001_detail_leases.sql
+-- Detay worker'ları için lease tabanlı satır sahiplenme.
+-- Birden fazla process/node aynı anda fill_missing_details çalıştırabilir:
+-- her worker ayrık bir batch alır, süresi dolan lease'ler tekrar sahiplenilir.
+
+ALTER TABLE public.articles
+  ADD COLUMN IF NOT EXISTS claimed_by      text,
+  ADD COLUMN IF NOT EXISTS lease_until     timestamptz,
+  ADD COLUMN IF NOT EXISTS detail_attempts integer NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS articles_detail_pending_idx
+  ON public.articles (site_adi, id)
+  WHERE detail_checked = false;
+
+
+-- Bekleyen (detail_checked=false) ve lease'i olmayan/süresi dolmuş satırları sahiplen.
+CREATE OR REPLACE FUNCTION public.claim_article_details(
+  p_site          text,
+  p_worker        text,
+  p_limit         integer DEFAULT 25,
+  p_lease_seconds integer DEFAULT 600
+)
+RETURNS SETOF public.articles
+LANGUAGE sql
+AS $$
+  UPDATE public.articles a
+     SET claimed_by      = p_worker,
+         lease_until     = now() + make_interval(secs => p_lease_seconds),
+         detail_attempts = a.detail_attempts + 1
+   WHERE a.id IN (
+           SELECT id
+             FROM public.articles
+            WHERE site_adi = p_site
+              AND detail_checked = false
+              AND (lease_until IS NULL OR lease_until < now())
+            ORDER BY id
+            LIMIT p_limit
+              FOR UPDATE SKIP LOCKED
+         )
+  RETURNING a.*;
+$$;
+
+
+-- Sonuçları yaz ve lease'i bırak. Sadece hâlâ bu worker'a ait VE lease'i dolmamış satırlar
+-- güncellenir: lease'i dolan (başka worker'a geçmiş ya da geçebilecek) satırın üzerine yazılmaz.
+CREATE OR REPLACE FUNCTION public.complete_article_details(
+  p_worker text,
+  p_rows   jsonb
+)
+RETURNS integer
+LANGUAGE sql
+AS $$
+  WITH upd AS (
+    UPDATE public.articles a
+       SET baslik         = r.baslik,
+           yayin_tarihi   = r.yayin_tarihi,
+           keyword        = r.keyword,
+           detail_checked = true,
+           claimed_by     = NULL,
+           lease_until    = NULL,
+           updated_at     = now()
+      FROM jsonb_to_recordset(p_rows) AS r(url text, baslik text, yayin_tarihi text, keyword text)
+     WHERE a.url = r.url
+       AND a.claimed_by = p_worker
+       AND a.lease_until > now()
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM upd;
+$$;
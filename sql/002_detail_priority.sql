@@ -0,0 +1,130 @@
+-- 002_detail_priority.sql
+-- Detay backlog'u için öncelik sırası (001_detail_leases.sql üzerine).
+--   1) taze olanlar (lastmod ya da keşif zamanı son p_fresh_hours içinde)
+--   2) en az denenmiş olanlar
+--   3) HTTP fast path'le çözülebilenler, Selenium gerektirenlerden önce
+--   4) en yeni önce
+-- Sonuç çıkmayan satırlar bekleyen kalır (detail_attempts + needs_browser yazılır,
+-- lease_until bir sonraki deneme zamanı olur); DETAIL_MAX_ATTEMPTS sonra vazgeçilir.
+-- release_article_details: sahiplenilip işlenmeyen satırları geri bırakır.
+-- Tekrar çalıştırılabilir; 001'i bundan SONRA tekrar çalıştırmayın (eski claim/complete'i geri getirir).
+
+ALTER TABLE public.articles
+  ADD COLUMN IF NOT EXISTS lastmod       timestamptz,              -- sitemap lastmod (varsa)
+  ADD COLUMN IF NOT EXISTS needs_browser boolean NOT NULL DEFAULT false;
+
+CREATE INDEX IF NOT EXISTS articles_detail_fresh_idx
+  ON public.articles (site_adi, (coalesce(lastmod, created_at)) DESC)
+  WHERE detail_checked = false;
+
+
+-- Lease'siz (tek worker) öncelikli okuma.
+CREATE OR REPLACE FUNCTION public.next_article_details(
+  p_site        text,
+  p_limit       integer DEFAULT 25,
+  p_fresh_hours integer DEFAULT 24
+)
+RETURNS SETOF public.articles
+LANGUAGE sql STABLE
+AS $$
+  SELECT *
+    FROM public.articles
+   WHERE site_adi = p_site
+     AND detail_checked = false
+     AND (lease_until IS NULL OR lease_until < now())
+   ORDER BY (coalesce(lastmod, created_at) > now() - make_interval(hours => p_fresh_hours)) DESC,
+            detail_attempts ASC,
+            needs_browser ASC,
+            coalesce(lastmod, created_at) DESC,
+            id
+   LIMIT p_limit;
+$$;
+
+
+-- claim_article_details aynı öncelik sırasıyla yeniden tanımlanır.
+DROP FUNCTION IF EXISTS public.claim_article_details(text, text, integer, integer);
+
+CREATE OR REPLACE FUNCTION public.claim_article_details(
+  p_site          text,
+  p_worker        text,
+  p_limit         integer DEFAULT 25,
+  p_lease_seconds integer DEFAULT 600,
+  p_fresh_hours   integer DEFAULT 24
+)
+RETURNS SETOF public.articles
+LANGUAGE sql
+AS $$
+  UPDATE public.articles a
+     SET claimed_by      = p_worker,
+         lease_until     = now() + make_interval(secs => p_lease_seconds),
+         detail_attempts = a.detail_attempts + 1
+   WHERE a.id IN (
+           SELECT id
+             FROM public.articles
+            WHERE site_adi = p_site
+              AND detail_checked = false
+              AND (lease_until IS NULL OR lease_until < now())
+            ORDER BY (coalesce(lastmod, created_at) > now() - make_interval(hours => p_fresh_hours)) DESC,
+                     detail_attempts ASC,
+                     needs_browser ASC,
+                     coalesce(lastmod, created_at) DESC,
+                     id
+            LIMIT p_limit
+              FOR UPDATE SKIP LOCKED
+         )
+  RETURNING a.*;
+$$;
+
+
+-- complete_article_details needs_browser'ı da yazar. detail_checked=false gelen satır
+-- (sonuç çıkmadı) bekleyen kalır: lease bırakılır ama retry_seconds boyunca tekrar alınmaz.
+-- detail_attempts'e dokunulmaz (claim zaten artırdı).
+CREATE OR REPLACE FUNCTION public.complete_article_details(
+  p_worker text,
+  p_rows   jsonb
+)
+RETURNS integer
+LANGUAGE sql
+AS $$
+  WITH upd AS (
+    UPDATE public.articles a
+       SET baslik         = r.baslik,
+           yayin_tarihi   = r.yayin_tarihi,
+           keyword        = r.keyword,
+           needs_browser  = coalesce(r.needs_browser, a.needs_browser),
+           detail_checked = coalesce(r.detail_checked, true),
+           claimed_by     = NULL,
+           lease_until    = CASE WHEN coalesce(r.detail_checked, true) THEN NULL
+                                 ELSE now() + make_interval(secs => coalesce(r.retry_seconds, 0)) END,
+           updated_at     = now()
+      FROM jsonb_to_recordset(p_rows) AS r(url text, baslik text, yayin_tarihi text, keyword text,
+                                           needs_browser boolean, detail_checked boolean, retry_seconds integer)
+     WHERE a.url = r.url
+       AND a.claimed_by = p_worker
+       AND a.lease_until > now()
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM upd;
+$$;
+
+
+-- Sahiplenilip hiç işlenmeyen satırları (ör. run bütçesi bitti) geri bırak:
+-- lease kalkar, claim'in artırdığı detail_attempts geri alınır.
+CREATE OR REPLACE FUNCTION public.release_article_details(
+  p_worker text,
+  p_urls   text[]
+)
+RETURNS integer
+LANGUAGE sql
+AS $$
+  WITH upd AS (
+    UPDATE public.articles a
+       SET claimed_by      = NULL,
+           lease_until     = NULL,
+           detail_attempts = greatest(a.detail_attempts - 1, 0)
+     WHERE a.url = ANY(p_urls)
+       AND a.claimed_by = p_worker
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM upd;
+$$;
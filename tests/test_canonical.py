@@ -0,0 +1,40 @@
+# tests/test_canonical.py
+from canonical import canonical_url, drop_cross_path_duplicates, site_for_url, url_variants
+
+
+def test_canonical_url_per_site_rules():
+    assert canonical_url("http://dentway.com.tr//blog/implant?utm=x#top") == "https://www.dentway.com.tr/blog/implant/"
+    assert canonical_url("https://WWW.florence.com.tr/saglik-rehberi/bel-agrisi/") \
+        == "https://www.florence.com.tr/saglik-rehberi/bel-agrisi"
+    assert canonical_url("https://www.clinic-wise.com/blog/x") == "https://clinic-wise.com/blog/x/"
+    assert canonical_url("http://www.dentway.com.tr:80/blog/a") == "https://www.dentway.com.tr/blog/a/"
+    # ana host dışı alt domainler ve portlar korunur
+    assert canonical_url("http://en.florence.com.tr/a/") == "http://en.florence.com.tr/a/"
+    assert canonical_url("https://clinic-wise.com:8080/x") == "https://clinic-wise.com:8080/x"
+    # http(s) olmayanlar ve bilinmeyen siteler
+    assert canonical_url("tel:+90212") == "tel:+90212"
+    assert canonical_url("https://Example.com/a/") == "https://example.com/a/"
+    assert site_for_url("https://en.florence.com.tr/x") == "Florence"
+
+
+def test_url_variants_cover_legacy_forms():
+    assert set(url_variants("https://www.dentway.com.tr/blog/implant/")) == {
+        "https://www.dentway.com.tr/blog/implant",
+        "https://www.dentway.com.tr/blog/implant/",
+        "https://dentway.com.tr/blog/implant",
+        "https://dentway.com.tr/blog/implant/",
+    }
+    assert url_variants("tel:+90212") == ["tel:+90212"]
+
+
+def test_cross_path_duplicate_uses_all_known_urls():
+    known = ["https://www.dentway.com.tr/blog/implant-tedavisi/"]
+    new = [
+        "https://www.dentway.com.tr/tedavi/implant-tedavisi/",      # aynı slug, başka path -> atla
+        "https://www.dentway.com.tr/blog/implant-tedavisi-fiyat/",  # benzer ama farklı slug -> kalır
+        "https://www.dentway.com.tr/blog/dis-beyazlatma/",
+        "https://www.dentway.com.tr/tedavi/Dis-Beyazlatma/",        # yeni linkler arasında tekrar
+    ]
+    unique, dropped = drop_cross_path_duplicates(new, known)
+    assert unique == new[1:3]
+    assert dropped == [(new[0], known[0]), (new[3], new[2])]
@@ -0,0 +1,82 @@
+import json
+import os
+
+from checkpoint import CrawlCheckpoint
+
+
+PAGES = ["https://x.com/blog", "https://x.com/blog/page/2", "https://x.com/blog/page/3"]
+
+
+def _on_disk(ck):
+    with open(ck.path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_plan_only_seeds_fresh_checkpoint(tmp_path):
+    ck = CrawlCheckpoint("Site", directory=tmp_path)
+    assert not ck.resumed
+    ck.plan(PAGES)
+    assert ck.frontier == PAGES
+    assert _on_disk(ck)["frontier"] == PAGES
+
+    ck.mark_visited(PAGES[0])
+    ck.plan(["https://x.com/other"])   # yarıda kalmış crawl'ın planı ezilmez
+    assert ck.frontier == PAGES[1:]
+
+
+def test_visit_and_skip_survive_restart(tmp_path):
+    ck = CrawlCheckpoint("Site", directory=tmp_path)
+    ck.plan(PAGES)
+    assert ck.add_links(["https://x.com/a", "https://x.com/b"]) == 2
+    assert ck.add_links(["https://x.com/a"]) == 0
+    ck.mark_visited(PAGES[0])
+
+    again = CrawlCheckpoint("site", directory=tmp_path)
+    assert again.resumed
+    assert again.is_visited(PAGES[0])
+    assert not again.is_visited(PAGES[1])
+    assert again.frontier == PAGES[1:]
+    assert list(again.links) == ["https://x.com/a", "https://x.com/b"]
+
+
+def test_add_links_waits_for_page_flush(tmp_path):
+    ck = CrawlCheckpoint("Site", directory=tmp_path, flush_every=2)
+    ck.plan(PAGES)
+    ck.add_links(["https://x.com/a"])
+    assert _on_disk(ck)["links"] == []
+
+    ck.mark_visited(PAGES[0])
+    assert _on_disk(ck)["visited"] == []
+
+    ck.mark_visited(PAGES[1])
+    state = _on_disk(ck)
+    assert state["links"] == ["https://x.com/a"]
+    assert sorted(state["visited"]) == sorted(PAGES[:2])
+
+
+def test_collected_is_persisted(tmp_path):
+    ck = CrawlCheckpoint("Site", directory=tmp_path, flush_every=100)
+    ck.plan(PAGES)
+    ck.add_links(["https://x.com/a"])
+    ck.mark_collected()
+
+    again = CrawlCheckpoint("Site", directory=tmp_path)
+    assert again.collected
+    assert again.frontier == []
+    assert list(again.links) == ["https://x.com/a"]
+
+
+def test_commit_clears_only_after_successful_save(tmp_path):
+    ck = CrawlCheckpoint("Site", directory=tmp_path)
+    ck.plan(PAGES)
+    ck.add_links(["https://x.com/a"])
+    ck.mark_collected()
+
+    assert not ck.commit(lambda: False)
+    assert os.path.exists(ck.path)
+    assert list(CrawlCheckpoint("Site", directory=tmp_path).links) == ["https://x.com/a"]
+
+    assert ck.commit(lambda: True)
+    assert not os.path.exists(ck.path)
+    fresh = CrawlCheckpoint("Site", directory=tmp_path)
+    assert not fresh.resumed and not fresh.collected and not fresh.links
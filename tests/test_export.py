@@ -0,0 +1,117 @@
+# tests/test_export.py
+import gzip
+import json
+import os
+from functools import partial
+
+from export import LinkifyExporter, build_linkify_payload
+from linkify_stub import start_stub_server
+
+
+ROWS = [
+    {"id": 1, "site_adi": "Dentway", "url": "https://www.dentway.com.tr/blog/implant/",
+     "baslik": "İmplant Tedavisi Nedir?", "keyword": "İmplant Tedavisi"},
+    {"id": 2, "site_adi": "Florence", "url": "https://www.florence.com.tr/saglik-rehberi/bel-agrisi",
+     "baslik": None, "keyword": "Bel Ağrısı"},
+    {"id": 3, "site_adi": "ClinicWise", "url": "https://clinic-wise.com/blog/hair-transplant/",
+     "baslik": "Hair Transplant", "keyword": "Hair Transplant", "icerik": "x" * 250},
+    # domain'i bilinmeyen site ve boş satır atlanır
+    {"id": 4, "site_adi": "Baska", "url": "https://example.com/a", "baslik": "A", "keyword": "A"},
+    {"id": 5, "site_adi": "Dentway", "url": "https://www.dentway.com.tr/blog/x/", "baslik": None, "keyword": None},
+]
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+        self._after = 0
+        self._limit = None
+
+    def select(self, columns):
+        return self
+
+    def gt(self, col, value):
+        self._after = value
+        return self
+
+    def eq(self, col, value):
+        self.rows = [r for r in self.rows if r.get(col) == value]
+        return self
+
+    def order(self, col):
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        data = sorted((r for r in self.rows if r["id"] > self._after), key=lambda r: r["id"])
+        return type("Res", (), {"data": data[:self._limit]})
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, name):
+        assert name == "articles"
+        return _Query(list(self.rows))
+
+
+def test_build_payload_from_existing_fields():
+    p = build_linkify_payload(ROWS[0])
+    assert p == {
+        "text": "İmplant Tedavisi Nedir?",
+        "topic": "İmplant Tedavisi Nedir?",
+        "domain": "www.dentway.com.tr",
+    }
+    assert build_linkify_payload(ROWS[0], include_url=True) == {**p, "url": ROWS[0]["url"]}
+    assert build_linkify_payload(ROWS[1])["text"] == "Bel Ağrısı"
+    assert build_linkify_payload(ROWS[2])["text"] == "x" * 250
+    assert build_linkify_payload(ROWS[3]) is None
+    assert build_linkify_payload(ROWS[4]) is None
+
+
+def test_export_post_against_stub(tmp_path):
+    received = tmp_path / "received.jsonl"
+    server, endpoint = start_stub_server(out_path=str(received))
+    try:
+        exporter = LinkifyExporter(
+            FakeSupabase(ROWS), partial(build_linkify_payload, include_url=True), mode="post",
+            out_dir=str(tmp_path / "out"), endpoint=endpoint, page_size=2, concurrency=2,
+        )
+        state = exporter.run()
+    finally:
+        server.shutdown()
+
+    assert state["exported"] == 3
+    assert state["skipped"] == 2
+    assert state["failed"] == 0
+    assert state["last_id"] == 5
+
+    got = [json.loads(line) for line in received.read_text(encoding="utf-8").splitlines()]
+    assert sorted(p["url"] for p in got) == sorted(r["url"] for r in ROWS[:3])
+
+
+def test_export_file_resumes_from_state(tmp_path):
+    out = tmp_path / "out"
+    sb = FakeSupabase(ROWS)
+
+    state = LinkifyExporter(sb, build_linkify_payload, out_dir=str(out), page_size=2, shard_rows=2).run()
+    assert state["exported"] == 3
+
+    shards = sorted(f for f in os.listdir(out) if f.endswith(".jsonl.gz"))
+    lines = []
+    for f in shards:
+        with gzip.open(out / f, "rt", encoding="utf-8") as fh:
+            lines += [json.loads(x) for x in fh]
+    assert [p["text"] for p in lines] == ["İmplant Tedavisi Nedir?", "Bel Ağrısı", "x" * 250]
+    assert all(set(p) == {"text", "topic", "domain"} for p in lines)
+
+    # aynı komut tekrar: kaldığı yerden (hiçbir şey kalmadı), tekrar yazmaz
+    sb.rows = ROWS + [{"id": 6, "site_adi": "Dentway", "url": "https://www.dentway.com.tr/blog/yeni/",
+                       "baslik": "Yeni", "keyword": "Yeni"}]
+    state = LinkifyExporter(sb, build_linkify_payload, out_dir=str(out), page_size=2, shard_rows=2).run()
+    assert state["exported"] == 4
+    assert state["last_id"] == 6
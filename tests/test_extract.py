@@ -0,0 +1,45 @@
+# tests/test_extract.py
+from extract import clean_title, extract_detail_from_html, to_iso_date
+from reprocess import transform_titles
+
+
+def test_clean_title_only_strips_known_brand_suffix():
+    assert clean_title("Bel Ağrısı — Ne Zaman Doktora Gitmeli?", "Florence") == "Bel Ağrısı — Ne Zaman Doktora Gitmeli?"
+    assert clean_title("Bel Ağrısı — Ne Zaman Doktora Gitmeli? | Florence Nightingale Hastanesi", "Florence") \
+        == "Bel Ağrısı — Ne Zaman Doktora Gitmeli?"
+    assert clean_title("İmplant Nedir?  | Dentway", "Dentway") == "İmplant Nedir?"
+    assert clean_title("Hair Transplant - Clinic-Wise.com") == "Hair Transplant"
+    # sadece markadan ibaret başlık olduğu gibi kalır
+    assert clean_title("Dentway", "Dentway") == "Dentway"
+
+
+def test_transform_titles_keeps_separator_titles():
+    row = {"url": "https://www.florence.com.tr/saglik-rehberi/bel-agrisi", "site_adi": "Florence",
+           "baslik": "Bel Ağrısı — Ne Zaman Doktora Gitmeli?", "keyword": "Bel Ağrısı"}
+    assert transform_titles(row) is None
+
+    row["baslik"] += " | Florence Nightingale"
+    assert transform_titles(row)["baslik"] == "Bel Ağrısı — Ne Zaman Doktora Gitmeli?"
+
+
+def test_non_string_headline_falls_back_to_og_title():
+    html = (
+        '<html><head>'
+        '<script type="application/ld+json">{"@type": "BlogPosting", "headline": {"@value": "x"},'
+        ' "datePublished": "2024-03-12"}</script>'
+        '<meta property="og:title" content="Bel Ağrısı — Ne Zaman Doktora Gitmeli? | Florence Nightingale">'
+        '</head><body></body></html>'
+    )
+    assert extract_detail_from_html("Florence", html) == ("Bel Ağrısı — Ne Zaman Doktora Gitmeli?", "2024-03-12")
+
+
+def test_numeric_dates_follow_site_order():
+    assert to_iso_date("03/12/2024") == "2024-12-03"
+    assert to_iso_date("03/12/2024", "mdy") == "2024-03-12"
+    # sıraya göre imkânsız tarih diğer sırayla okunur
+    assert to_iso_date("25/12/2024", "mdy") == "2024-12-25"
+
+    html = ('<html><head><meta property="og:type" content="article"></head><body>'
+            '<article><h1>Hair Transplant Recovery Guide</h1><time>03/12/2024</time></article></body></html>')
+    assert extract_detail_from_html("ClinicWise", html) == ("Hair Transplant Recovery Guide", "2024-03-12")
+    assert extract_detail_from_html("Dentway", html)[1] == "2024-12-03"
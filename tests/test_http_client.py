@@ -0,0 +1,66 @@
+# tests/test_http_client.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from http_client import PerOriginLimiter, make_http_client
+
+
+class SlowClient:
+    """Origin başına anlık ve tepe eşzamanlılığı sayan sahte istemci."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.closed = False
+
+    def get(self, url, **kwargs):
+        origin = url.split("/")[2]
+        with self.lock:
+            self.active[origin] = self.active.get(origin, 0) + 1
+            self.peak[origin] = max(self.peak.get(origin, 0), self.active[origin])
+        time.sleep(0.02)
+        with self.lock:
+            self.active[origin] -= 1
+        return url
+
+    def close(self):
+        self.closed = True
+
+
+def test_per_origin_limit_holds_for_each_origin():
+    client = SlowClient()
+    limiter = PerOriginLimiter(client, 3)
+    urls = [f"https://{host}/yazi-{i}" for i in range(20) for host in ("www.dentway.com.tr", "clinic-wise.com")]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        assert list(pool.map(limiter.get, urls)) == urls
+
+    assert set(client.peak) == {"www.dentway.com.tr", "clinic-wise.com"}
+    assert all(1 < peak <= 3 for peak in client.peak.values())
+
+    limiter.close()
+    assert client.closed
+
+
+def test_make_http_client_backends():
+    client = make_http_client("requests", max_per_host=2)
+    assert isinstance(client, PerOriginLimiter) and client.limit == 2
+    client.close()
+
+    with pytest.raises(RuntimeError):
+        make_http_client("bogus")
+
+
+def test_make_http_client_http2():
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    client = make_http_client("http2", max_per_host=4, keepalive_seconds=5)
+    try:
+        assert isinstance(client, PerOriginLimiter) and client.limit == 4
+        assert isinstance(client.client, httpx.Client)
+    finally:
+        client.close()
@@ -0,0 +1,16 @@
+# tests/test_keywords.py
+from keywords import keyword_for, keywords_for_rows
+
+
+def test_dotted_capital_i_does_not_split_words():
+    # "İ".lower() birleşik nokta üretir; kelime "mplant"e bölünmemeli
+    assert keyword_for("İmplant Tedavisi Nedir?", "https://www.dentway.com.tr/blog/x/") == "Implant Tedavisi"
+    assert keyword_for(None, "https://www.dentway.com.tr/blog/%C4%B0mplant-tedavisi/") == "Implant Tedavisi"
+
+
+def test_batch_matches_single():
+    rows = [
+        {"baslik": "Diş Beyazlatma Nasıl Yapılır | Dentway", "url": "https://www.dentway.com.tr/blog/a/"},
+        {"baslik": None, "url": "https://www.florence.com.tr/saglik-rehberi/bel-agrisi-nedir"},
+    ]
+    assert keywords_for_rows(rows) == [keyword_for(r["baslik"], r["url"]) for r in rows]
@@ -0,0 +1,160 @@
+# tests/test_leases.py
+"""
+sql/001 + sql/002 lease RPC'lerinin lokal Postgres'e karşı testi.
+LEASE_TEST_DATABASE_URL atılabilir bir veritabanını göstermeli (articles tablosu yoksa oluşturulur).
+"""
+import json
+import os
+import uuid
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+DSN = os.getenv("LEASE_TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DSN, reason="LEASE_TEST_DATABASE_URL yok")
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql")
+
+ARTICLES_DDL = """
+CREATE TABLE IF NOT EXISTS public.articles (
+  id             bigserial PRIMARY KEY,
+  created_at     timestamptz NOT NULL DEFAULT now(),
+  updated_at     timestamptz,
+  site_adi       text,
+  baslik         text,
+  url            text UNIQUE,
+  yayin_tarihi   text,
+  keyword        text,
+  detail_checked boolean NOT NULL DEFAULT false
+)
+"""
+
+
+def _connect():
+    return psycopg.connect(DSN, autocommit=True)
+
+
+@pytest.fixture(scope="module")
+def schema():
+    with _connect() as conn:
+        conn.execute(ARTICLES_DDL)
+        for name in ("001_detail_leases.sql", "002_detail_priority.sql"):
+            with open(os.path.join(SQL_DIR, name), encoding="utf-8") as f:
+                conn.execute(f.read())
+
+
+@pytest.fixture
+def site(schema):
+    """Her test kendi site_adi'siyle çalışır, sonunda satırlarını siler."""
+    name = f"lease-test-{uuid.uuid4().hex[:8]}"
+    with _connect() as conn:
+        for i in range(6):
+            conn.execute(
+                "INSERT INTO public.articles (site_adi, url) VALUES (%s, %s)",
+                (name, f"https://example.com/{name}/{i}"),
+            )
+    yield name
+    with _connect() as conn:
+        conn.execute("DELETE FROM public.articles WHERE site_adi = %s", (name,))
+
+
+def claim(conn, site, worker, limit):
+    rows = conn.execute(
+        "SELECT url FROM public.claim_article_details(p_site => %s, p_worker => %s, p_limit => %s)",
+        (site, worker, limit),
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def complete(conn, worker, urls):
+    rows = [{"url": u, "baslik": "Başlık", "yayin_tarihi": None, "keyword": "Başlık"} for u in urls]
+    return conn.execute(
+        "SELECT public.complete_article_details(%s, %s::jsonb)", (worker, json.dumps(rows))
+    ).fetchone()[0]
+
+
+def expire(conn, urls):
+    conn.execute(
+        "UPDATE public.articles SET lease_until = now() - interval '1 minute' WHERE url = ANY(%s)",
+        (list(urls),),
+    )
+
+
+def test_two_sessions_claim_disjoint_batches(site):
+    with _connect() as a, _connect() as b:
+        # A'nın transaction'ı açıkken satır kilitleri tutuluyor: B SKIP LOCKED ile kalanları almalı
+        with a.transaction():
+            got_a = claim(a, site, "worker-a", 3)
+            got_b = claim(b, site, "worker-b", 3)
+
+    assert len(got_a) == 3 and len(got_b) == 3
+    assert not got_a & got_b
+
+    with _connect() as conn:
+        # hepsi lease'li: üçüncü worker bir şey alamaz
+        assert claim(conn, site, "worker-c", 10) == set()
+
+
+def test_expired_lease_is_reclaimed(site):
+    with _connect() as conn:
+        first = claim(conn, site, "worker-a", 2)
+        expire(conn, first)
+
+        again = claim(conn, site, "worker-b", 10)
+        assert first <= again
+
+        attempts = conn.execute(
+            "SELECT detail_attempts, claimed_by FROM public.articles WHERE url = ANY(%s)", (list(first),)
+        ).fetchall()
+        assert attempts == [(2, "worker-b")] * 2
+
+
+def test_write_after_losing_lease_is_rejected(site):
+    with _connect() as conn:
+        urls = claim(conn, site, "worker-a", 2)
+        expire(conn, urls)
+
+        # lease dolmuş ama henüz kimse almamış: yine de yazılmaz
+        assert complete(conn, "worker-a", urls) == 0
+
+        # başka worker aldı: eski sahip yazamaz, yeni sahip yazar
+        assert urls <= claim(conn, site, "worker-b", 10)
+        assert complete(conn, "worker-a", urls) == 0
+        assert complete(conn, "worker-b", urls) == 2
+
+        rows = conn.execute(
+            "SELECT detail_checked, claimed_by, baslik FROM public.articles WHERE url = ANY(%s)", (list(urls),)
+        ).fetchall()
+        assert rows == [(True, None, "Başlık")] * 2
+
+
+def test_release_undoes_claim_and_pending_completion_backs_off(site):
+    with _connect() as conn:
+        urls = sorted(claim(conn, site, "worker-a", 3))
+
+        # bütçe bitti: ilk satır hiç işlenmedi -> lease kalkar, deneme geri alınır
+        released = conn.execute(
+            "SELECT public.release_article_details(%s, %s)", ("worker-a", [urls[0]])
+        ).fetchone()[0]
+        assert released == 1
+
+        # ikinci satırdan sonuç çıkmadı: bekleyen kalır, retry süresince alınmaz
+        pending = [{"url": urls[1], "baslik": None, "yayin_tarihi": None, "keyword": "Genel",
+                    "needs_browser": True, "detail_checked": False, "retry_seconds": 3600}]
+        assert conn.execute(
+            "SELECT public.complete_article_details(%s, %s::jsonb)", ("worker-a", json.dumps(pending))
+        ).fetchone()[0] == 1
+
+        rows = dict(
+            (r[0], r[1:]) for r in conn.execute(
+                "SELECT url, detail_attempts, claimed_by, detail_checked, needs_browser, lease_until > now()"
+                "  FROM public.articles WHERE url = ANY(%s)", (urls[:2],),
+            ).fetchall()
+        )
+        assert rows[urls[0]] == (0, None, False, False, None)
+        assert rows[urls[1]] == (1, None, False, True, True)
+
+        again = claim(conn, site, "worker-b", 10)
+        assert urls[0] in again
+        assert urls[1] not in again
@@ -0,0 +1,41 @@
+# tests/test_selector_stats.py
+from bs4 import BeautifulSoup
+
+from selector_stats import SelectorStats
+
+CLINICWISE_TITLE = ["article h1", ".blog-title", "h1"]
+
+LANDING = "<html><body><header><h1>ClinicWise</h1></header><main>...</main></body></html>"
+ARTICLE = ("<html><body><header><h1>ClinicWise</h1></header>"
+           "<article><h1>Hair Transplant Recovery Guide</h1></article></body></html>")
+
+
+def test_generic_selector_never_promoted_over_specific():
+    stats = SelectorStats(path=None, stale_after=5)
+    # çok sayıda landing sayfası: sadece genel "h1" tutar
+    for _ in range(100):
+        assert stats.pick_text(BeautifulSoup(LANDING, "html.parser"), "ClinicWise", "title", CLINICWISE_TITLE) == "ClinicWise"
+
+    soup = BeautifulSoup(ARTICLE, "html.parser")
+    assert stats.pick_text(soup, "ClinicWise", "title", CLINICWISE_TITLE) == "Hair Transplant Recovery Guide"
+
+
+def test_only_trailing_dead_selectors_are_skipped_until_probe(tmp_path):
+    path = tmp_path / "stats.json"
+    selectors = ["h1", ".entry-title", "article h1"]
+    stats = SelectorStats(path=str(path), stale_after=3, probe_every=100)
+    for html in (ARTICLE, LANDING, "<html><body><p>yok</p></body></html>") * 3:
+        stats.pick_text(BeautifulSoup(html, "html.parser"), "Dentway", "title", selectors)
+
+    # "h1" tutuyor; arkasındaki hiç tutmayanlar atlanır
+    assert stats.candidates("Dentway", "title", selectors) == ["h1"]
+    # ClinicWise: tutmayan "article h1" tutan "h1"in önünde, atlanmaz
+    for _ in range(5):
+        stats.pick_text(BeautifulSoup(LANDING, "html.parser"), "ClinicWise", "title", CLINICWISE_TITLE)
+    assert stats.candidates("ClinicWise", "title", CLINICWISE_TITLE) == CLINICWISE_TITLE
+    stats.save()
+
+    # diskten geri yüklenir; probe turunda tüm liste sırasıyla denenir
+    again = SelectorStats(path=str(path), stale_after=3, probe_every=2)
+    assert again.candidates("Dentway", "title", selectors) == ["h1"]
+    assert again.candidates("Dentway", "title", selectors) == selectors
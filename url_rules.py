@@ -0,0 +1,65 @@
+# url_rules.py
+import re
+from urllib.parse import urlsplit
+
+
+class UrlClassifier:
+    """
+    Site için deklaratif kurallardan bir kez derlenen makale URL filtresi.
+
+    rules:
+      domain            : "dentway.com.tr" (alt domainler de kabul)
+      blocked_substrings: URL'nin herhangi bir yerinde geçerse red (whatsapp.com, tel: ...)
+      allowed_prefixes  : path (sonuna "/" eklenmiş hali) bunlardan biriyle başlamalı
+      blocked_prefixes  : path (sonuna "/" eklenmiş hali) bunlarla başlarsa red
+      blocked_exact     : trailing slash'sız path birebir eşleşirse red
+      min_path_len      : trailing slash'sız path en az bu uzunlukta olmalı
+
+    Her URL tek sefer parse edilir; prefix kontrolleri tek regex ile yapılır.
+    """
+
+    def __init__(self, rules: dict):
+        self.domain = rules["domain"].lower()
+        self._dot_domain = "." + self.domain
+
+        bad = rules.get("blocked_substrings") or ()
+        self._bad = re.compile("|".join(map(re.escape, bad))) if bad else None
+
+        allowed = rules.get("allowed_prefixes") or ()
+        self._allowed = re.compile("(?:%s)" % "|".join(map(re.escape, allowed))) if allowed else None
+
+        blocked = rules.get("blocked_prefixes") or ()
+        self._blocked = re.compile("(?:%s)" % "|".join(map(re.escape, blocked))) if blocked else None
+
+        self._blocked_exact = frozenset(rules.get("blocked_exact") or ())
+        self._min_len = int(rules.get("min_path_len") or 0)
+
+    def __call__(self, url: str) -> bool:
+        if self._bad is not None and self._bad.search(url):
+            return False
+
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return False
+
+        netloc = parts.netloc.lower()
+        if netloc != self.domain and not netloc.endswith(self._dot_domain):
+            return False
+
+        path = parts.path.rstrip("/")
+        if path in self._blocked_exact:
+            return False
+        if len(path) < self._min_len:
+            return False
+
+        slashed = path + "/"
+        if self._allowed is not None and not self._allowed.match(slashed):
+            return False
+        if self._blocked is not None and self._blocked.match(slashed):
+            return False
+        return True
+
+    def filter(self, urls) -> list[str]:
+        """Toplu filtre: geçerli URL'leri sırası korunarak, tekrarsız döndürür."""
+        return list(dict.fromkeys(u for u in urls if self(u)))